@@ -2503,10 +2503,13 @@ class Get(MixedAllFilesSuggestionsCommandInfo, VarArgsSpec):
     QUIET = ["-q", "--quiet"]
     NO_HIDDEN = ["-h", "--no-hidden"]
     SYNC = ["-s", "--sync"]
+    PARALLEL = ["--parallel"]
+    SPLIT_SIZE = ["--split-size"]
 
     # Secret params
     MMAP = ["--mmap"]
     CHUNK_SIZE = ["--chunk-size"]
+    WINDOW = ["--window"]
 
     def options_spec(self) -> Optional[List[Option]]:
         return [
@@ -2520,9 +2523,12 @@ class Get(MixedAllFilesSuggestionsCommandInfo, VarArgsSpec):
             (self.QUIET, PRESENCE_PARAM),
             (self.NO_HIDDEN, PRESENCE_PARAM),
             (self.SYNC, PRESENCE_PARAM),
+            (self.PARALLEL, INT_PARAM),
+            (self.SPLIT_SIZE, INT_PARAM),
 
             (self.MMAP, INT_PARAM),
             (self.CHUNK_SIZE, INT_PARAM),
+            (self.WINDOW, INT_PARAM),
         ]
 
     @classmethod
@@ -2611,6 +2617,9 @@ with the options **-y** (yes), **-n** (no), **-N** (overwrite if newer) and **-S
             CommandOptionInfo(cls.QUIET, "doesn't show progress"),
             CommandOptionInfo(cls.NO_HIDDEN, "doesn't copy hidden files"),
             CommandOptionInfo(cls.SYNC, "synchronize (same as -N but remove old files)"),
+            CommandOptionInfo(cls.PARALLEL, "transfer over N additional connections", params=["N"]),
+            CommandOptionInfo(cls.SPLIT_SIZE, "split files bigger than SIZE in ranges "
+                                              "transferred in parallel", params=["SIZE"]),
         ]
 
     @classmethod
@@ -2741,11 +2750,14 @@ class Put(MixedAllFilesSuggestionsCommandInfo, VarArgsSpec):
     QUIET = ["-q", "--quiet"]
     NO_HIDDEN = ["-h", "--no-hidden"]
     SYNC = ["-s", "--sync"]
+    PARALLEL = ["--parallel"]
+    SPLIT_SIZE = ["--split-size"]
 
 
     # Secret params
     MMAP = ["--mmap"]
     CHUNK_SIZE = ["--chunk-size"]
+    WINDOW = ["--window"]
 
     def options_spec(self) -> Optional[List[Option]]:
         return [
@@ -2759,9 +2771,12 @@ class Put(MixedAllFilesSuggestionsCommandInfo, VarArgsSpec):
             (self.QUIET, PRESENCE_PARAM),
             (self.NO_HIDDEN, PRESENCE_PARAM),
             (self.SYNC, PRESENCE_PARAM),
+            (self.PARALLEL, INT_PARAM),
+            (self.SPLIT_SIZE, INT_PARAM),
 
             (self.MMAP, INT_PARAM),
             (self.CHUNK_SIZE, INT_PARAM),
+            (self.WINDOW, INT_PARAM),
         ]
 
     @classmethod
@@ -2840,6 +2855,9 @@ and **-S** (overwrite if size is different)."""
             CommandOptionInfo(cls.QUIET, "doesn't show progress"),
             CommandOptionInfo(cls.NO_HIDDEN, "doesn't copy hidden files"),
             CommandOptionInfo(cls.SYNC, "synchronize (same as -N but remove old files)"),
+            CommandOptionInfo(cls.PARALLEL, "transfer over N additional connections", params=["N"]),
+            CommandOptionInfo(cls.SPLIT_SIZE, "split files bigger than SIZE in ranges "
+                                              "transferred in parallel", params=["SIZE"]),
         ]
 
     @classmethod
@@ -58,6 +58,11 @@ DEFAULT_SERVER_PORT =   12020   # TCP
 DEFAULT_DISCOVER_WAIT = 2            # sec
 DEFAULT_TRANSFER_SOCKET_TIMEOUT = 120   # sec
 
+DEFAULT_TRANSFER_WINDOW = 64    # files announced ahead while pipelining
+MAX_TRANSFER_WINDOW = 1024
+MAX_TRANSFER_PARALLEL = 16      # data connections of a single transfer
+DEFAULT_TRANSFER_SPLIT_SIZE = 64 * 1024 * 1024  # files bigger than this are split in ranges
+
 BEST_BUFFER_SIZE = 4096
 
 # =====================
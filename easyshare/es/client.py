@@ -10,11 +10,11 @@ import zlib
 from collections import OrderedDict, deque
 from getpass import getpass
 from pathlib import Path
-from typing import Optional, Callable, List, Dict, Union, Tuple, cast, Any, Deque
+from typing import Optional, Callable, List, Dict, Union, Tuple, cast, Any, Deque, BinaryIO
 from easyshare.utils.progress import ProgressBarRendererFactory
 from easyshare.args import Args as Args, ArgsParseError, ArgsSpec
 from easyshare.common import DEFAULT_SERVER_PORT, SUCCESS_COLOR, PROGRESS_COLOR, BEST_BUFFER_SIZE, \
-    ERROR_COLOR, APP_VERSION
+    ERROR_COLOR, APP_VERSION, DEFAULT_TRANSFER_WINDOW, DEFAULT_TRANSFER_SPLIT_SIZE
 from easyshare.consts import ansi
 from easyshare.consts.net import ADDR_BROADCAST
 from easyshare.consts.os import STDIN
@@ -32,10 +32,11 @@ from easyshare.commands.commands import Commands, Ls, Scan, Info, Tree, Put, Get
 from easyshare.logging import get_logger
 from easyshare.protocol.requests import RequestsParams
 from easyshare.protocol.responses import is_data_response, is_error_response, is_success_response, ResponseError, \
-    create_error_of_response, ResponsesParams, Response
+    create_error_of_response, ResponsesParams, Response, create_success_response
 from easyshare.protocol.types import FileType, ServerInfoFull, FileInfoTreeNode, FileInfo, FTYPE_DIR, FTYPE_FILE, \
     ServerInfo, create_file_info, RexecEventType, ftype_of, create_file_info_full
 from easyshare.settings import get_setting, Settings
+from easyshare.sockets import SocketTcp
 from easyshare.styling import bold, green, red
 from easyshare.timer import Timer
 from easyshare.utils.env import is_unix, terminal_size
@@ -1160,9 +1161,24 @@ class Client:
 
         chunk_size = args.get_option_param(Get.CHUNK_SIZE)
         use_mmap = args.get_option_param(Get.MMAP)
+        window = args.get_option_param(Get.WINDOW, DEFAULT_TRANSFER_WINDOW)
+        parallel = args.get_option_param(Get.PARALLEL, 0)
+
+        # The ranges of the split files are written in place with pwrite()
+        split_size = args.get_option_param(Get.SPLIT_SIZE, DEFAULT_TRANSFER_SPLIT_SIZE) \
+            if hasattr(os, "pwrite") else 0
+
+        if parallel:
+            # The progress of concurrent transfers can't be shown
+            # on a single line
+            quiet = True
 
         transfer_socket = conn._stream._socket
 
+        # Preallocated once: the data is received directly into it
+        # and written to disk from it
+        recv_buffer = memoryview(bytearray(chunk_size or BEST_BUFFER_SIZE))
+
         # Overwrite preference
         if [Get.OVERWRITE_YES in args, Get.OVERWRITE_NO in args,
             True if (Get.OVERWRITE_NEWER in args or Get.OVERWRITE_DIFF_SIZE in args) else False,
@@ -1189,7 +1205,6 @@ class Client:
         log.i(f"Overwrite policy: {overwrite_policy}")
 
         # Stats
-        progressor = None
         timer = Timer(start=True)
         tot_bytes = 0
         n_files = 0
@@ -1198,6 +1213,22 @@ class Client:
         errors = []
         outcome_resp = None
 
+        # Guards the shared state while transferring
+        # over more data connections
+        transfer_lock = threading.Lock()
+        transfer_aborted = False
+
+        class SplitFile:
+            def __init__(self, action: str, local_path: Optional[Path], fd: Optional[int], remaining: int):
+                self.action = action
+                self.local_path = local_path
+                self.fd = fd
+                self.remaining = remaining
+                self.failed = False
+
+        # Files received in ranges (by remote name)
+        split_files: Dict[str, SplitFile] = {}
+
         # If sync is True track the files in the current directory
         # so that we can remove old files (the one for which no file info
         # is retrieved from the server) after the transfer completes.
@@ -1309,75 +1340,35 @@ class Client:
 
             return output
 
-        # Actual GET request is here
-        resp = conn.get(files,
-                        check=do_check, no_hidden=no_hidden,
-                        mmap=use_mmap, chunk_size=chunk_size)
-        ensure_success_response(resp)
-
-        while True:
-            # The first next() fetch never implies a new file to be put
-            # on the transfer socket.
-            # We have to check whether we want to eventually overwrite
-            # the file, and then tell the server next() if
-            # 1. Really transfer the file
-            # 2. Skip the file
-
-            # If OverwritePolicy.YES transfer immediately since we won't
-            # ask to the user whether overwrite or not.
-            # The only exception is if preview is True, in that case we won't
-            # perform the transfer so do a regular seek
-
-            if overwrite_policy == OverwritePolicy.YES and not preview:
-                action = RequestsParams.GET_NEXT_ACTION_TRANSFER
-            else:
-                action = RequestsParams.GET_NEXT_ACTION_SEEK
-
-            log.i(f"Sending '{action}' message")
-
-            get_next_resp = conn.call({
-                RequestsParams.GET_NEXT_ACTION: action
-            })
-
-            ensure_success_response(get_next_resp)
-            data = get_next_resp.get("data")
-
-            finfo: Optional[FileInfo] = None
-
-            if data:
-                finfo = data.get(ResponsesParams.GET_NEXT_FILE)
-
-            if not finfo:
-                log.i("Nothing more to GET")
-                if data and data.get(ResponsesParams.GET_OUTCOME) is not None:
-                    outcome_resp = get_next_resp
-                break
-
+        def decide_next(finfo_: FileInfo) -> Tuple[str, Optional[Path]]:
+            """
+            Decides what to do with the file (or directory) announced by
+            the server, handling --dest, the SYNC table and the overwrite policy.
+            Returns the action for the server (transfer, skip or abort)
+            and the local path of the file.
+            """
+            nonlocal overwrite_policy, preview_total_size
 
-            fname = finfo.get("name")
-            fsize = finfo.get("size")
-            ftype = finfo.get("ftype")
-            fmtime = finfo.get("mtime")
+            fname_ = finfo_.get("name")
+            fsize_ = finfo_.get("size")
+            ftype_ = finfo_.get("ftype")
+            fmtime_ = finfo_.get("mtime")
 
-            log.d(f"NEXT: '{fname}' [{ftype}]")
+            log.d(f"NEXT: '{fname_}' [{ftype_}]")
 
             try:
-                local_path = compute_dest_path(finfo)
+                local_path_ = compute_dest_path(finfo_)
             except Exception as exc:
                 log.eexception(f"Dest path computation failed: {exc}")
 
-                conn.write_json({
-                    RequestsParams.GET_NEXT_ACTION: RequestsParams.GET_NEXT_ACTION_ABORT
-                })
-
                 errors.append({
                     "errno": ClientErrors.GENERAL_ERROR,
                     "subjects": [str(exc)]
                 })
 
-                break
+                return RequestsParams.GET_NEXT_ACTION_ABORT, None
 
-            log.d(f"Computed local path: {local_path}")
+            log.d(f"Computed local path: {local_path_}")
 
             if sync:
                 if sync_table is None:
@@ -1388,7 +1379,7 @@ class Client:
                 # (so that we won't delete parent folder if the change is
                 # inside the children)
                 incremental_path = Path.cwd()
-                for part in local_path.parts:
+                for part in local_path_.parts:
                     incremental_path = incremental_path / part
                     incremental_path_str = str(incremental_path)
                     log.d(f"Removing from SYNC table: '{incremental_path_str}'")
@@ -1408,16 +1399,16 @@ class Client:
             """
 
             log.d(f"Handling GET case: "
-                  f"{ftype}2{ftype_of(local_path)}")
+                  f"{ftype_}2{ftype_of(local_path_)}")
 
             # Case: DIR
-            if ftype == FTYPE_DIR:
-                if not local_path.exists():
+            if ftype_ == FTYPE_DIR:
+                if not local_path_.exists():
                     # dir2none => create dir
                     if not preview:
-                        log.i(f"Creating directory {fname}")
+                        log.i(f"Creating directory {fname_}")
                         try:
-                            local_path.mkdir(parents=True, exist_ok=True)
+                            local_path_.mkdir(parents=True, exist_ok=True)
                         except:
                             log.eexception("Failed to create parent directories; "
                                            "probably won't be able to write file")
@@ -1426,161 +1417,137 @@ class Client:
                             # we won't be able to receive any file children
                             # of this one, but for now we will skip when we fail
                     else:
-                        print(green(f"+ [{size_str_justify(0)}] {local_path}"))
-                elif local_path.is_file():
+                        print(green(f"+ [{size_str_justify(0)}] {local_path_}"))
+                elif local_path_.is_file():
                     # dir2file => ERROR
-                    log.w(f"Tried to get a DIR while local FILE exists with the name: {local_path}")
+                    log.w(f"Tried to get a DIR while local FILE exists with the name: {local_path_}")
                 # else
                 #   dir2dir => no-op
 
-                continue  # No FTYPE_FILE => neither skip nor transfer for next()
+                return RequestsParams.GET_NEXT_ACTION_SKIP, local_path_
 
-            if ftype != FTYPE_FILE:
-                log.w(f"Cannot handle this ftype: {ftype}")
-                continue  # No FTYPE_FILE => neither skip nor transfer for next()
+            if ftype_ != FTYPE_FILE:
+                log.w(f"Cannot handle this ftype: {ftype_}")
+                return RequestsParams.GET_NEXT_ACTION_SKIP, local_path_
 
             # Case: FILE
-            local_path_parent = local_path.parent
-
-            if action == RequestsParams.GET_NEXT_ACTION_SEEK:
-                def skip_transfer():
-                    ensure_success_response(conn.call({
-                        RequestsParams.GET_NEXT_ACTION: RequestsParams.GET_NEXT_ACTION_SKIP
-                    }))
-
-                if local_path_parent:
-                    if not preview:
-                        log.i(f"Creating parent directories {local_path_parent}")
-                        try:
-                            local_path_parent.mkdir(parents=True, exist_ok=True)
-                        except:
-                            log.eexception("Failed to create parent directories; "
-                                           "probably won't be able to write file")
-                            skip_transfer()
-                            # TODO
-                            # A more clean way would be tell the server that
-                            # we won't be able to receive any file children
-                            # of this one, but for now we will skip when we fail
-                            continue
-
-                # Check whether the file already exists (and ensure is a file, if exists)
-
-                if local_path.is_dir():
-                    # file2dir => ERROR
-                    log.w(f"Tried to get a FILE while local DIR exists with the name: {local_path}")
-                    skip_transfer()
-                    continue
+            local_path_parent = local_path_.parent
 
-                if local_path.is_file():
-                    # file2file => overwrite (eventually)
-                    log.w("File already exists, asking whether overwrite it (if needed)")
+            if local_path_parent:
+                if not preview:
+                    log.i(f"Creating parent directories {local_path_parent}")
+                    try:
+                        local_path_parent.mkdir(parents=True, exist_ok=True)
+                    except:
+                        log.eexception("Failed to create parent directories; "
+                                       "probably won't be able to write file")
+                        return RequestsParams.GET_NEXT_ACTION_SKIP, local_path_
 
-                    local_stat = local_path.stat()
+            # Check whether the file already exists (and ensure is a file, if exists)
 
-                    # Overwrite handling
+            if local_path_.is_dir():
+                # file2dir => ERROR
+                log.w(f"Tried to get a FILE while local DIR exists with the name: {local_path_}")
+                return RequestsParams.GET_NEXT_ACTION_SKIP, local_path_
 
-                    timer.stop() # Don't take the user time into account
-                    current_overwrite_decision, overwrite_policy = self._ask_overwrite(
-                        local_info=create_file_info(local_path, fstat=local_stat),
-                        remote_info=finfo,
-                        current_policy=overwrite_policy
-                    )
-                    timer.start()
+            if local_path_.is_file():
+                # file2file => overwrite (eventually)
+                log.w("File already exists, asking whether overwrite it (if needed)")
 
-                    log.d(f"Overwrite decision: {current_overwrite_decision}")
+                local_stat = local_path_.stat()
 
-                    will_accept = False
+                # Overwrite handling
 
-                    if current_overwrite_decision == OverwritePolicy.YES:
-                        will_accept = True
-                    elif current_overwrite_decision in OverwritePolicy.NEWERS or \
-                        current_overwrite_decision in OverwritePolicy.DIFF_SIZES:
+                timer.stop() # Don't take the user time into account
+                current_overwrite_decision, overwrite_policy = self._ask_overwrite(
+                    local_info=create_file_info(local_path_, fstat=local_stat),
+                    remote_info=finfo_,
+                    current_policy=overwrite_policy
+                )
+                timer.start()
 
-                        if current_overwrite_decision in OverwritePolicy.NEWERS:
-                            log.d(f"Checking whether skip based on mtime ({local_stat.st_mtime_ns} vs {fmtime})")
-                            will_accept = will_accept or is_newer(fmtime, local_stat.st_mtime_ns)
+                log.d(f"Overwrite decision: {current_overwrite_decision}")
 
-                        if current_overwrite_decision in OverwritePolicy.DIFF_SIZES:
-                            log.d(f"Checking whether skip based on size ({local_stat.st_size} vs {fsize})")
-                            will_accept = will_accept or local_stat.st_size != fsize
+                will_accept = False
 
+                if current_overwrite_decision == OverwritePolicy.YES:
+                    will_accept = True
+                elif current_overwrite_decision in OverwritePolicy.NEWERS or \
+                    current_overwrite_decision in OverwritePolicy.DIFF_SIZES:
 
-                    if not will_accept:
-                        # We must not overwrite the file due to overwrite policy
-                        log.d(f"Would have seek, have to tell server to skip {fname}")
-                        skip_transfer()
-                        continue
+                    if current_overwrite_decision in OverwritePolicy.NEWERS:
+                        log.d(f"Checking whether skip based on mtime ({local_stat.st_mtime_ns} vs {fmtime_})")
+                        will_accept = will_accept or is_newer(fmtime_, local_stat.st_mtime_ns)
 
-                if preview:
-                    # Don't transfer since it's only a preview
-                    print(green(f"+ [{size_str_justify(fsize)}] {local_path}"))
-                    preview_total_size += fsize
-                    skip_transfer()
-                    continue
+                    if current_overwrite_decision in OverwritePolicy.DIFF_SIZES:
+                        log.d(f"Checking whether skip based on size ({local_stat.st_size} vs {fsize_})")
+                        will_accept = will_accept or local_stat.st_size != fsize_
 
-                #
+                if not will_accept:
+                    # We must not overwrite the file due to overwrite policy
+                    log.d(f"Have to tell server to skip {fname_}")
+                    return RequestsParams.GET_NEXT_ACTION_SKIP, local_path_
 
-                # Regular case, we did a seek and now tell the server to transfer
-                log.d(f"Would have seek, have to tell server to transfer {fname}")
+            if preview:
+                # Don't transfer since it's only a preview
+                print(green(f"+ [{size_str_justify(fsize_)}] {local_path_}"))
+                preview_total_size += fsize_
+                return RequestsParams.GET_NEXT_ACTION_SKIP, local_path_
 
-                get_next_resp = conn.call({
-                    RequestsParams.GET_NEXT_ACTION: RequestsParams.GET_NEXT_ACTION_TRANSFER
-                })
+            log.d(f"Have to tell server to transfer {fname_}")
+            return RequestsParams.GET_NEXT_ACTION_TRANSFER, local_path_
 
-                # The server may say the transfer can't be done actually (e.g. EPERM)
-                if is_success_response(get_next_resp):
-                    log.d("Transfer can actually begin")
-                elif is_error_response(get_next_resp):
-                    log.w("Transfer cannot be initialized due to remote error")
+        def receive_next(finfo_: FileInfo, local_path_: Path,
+                         transfer_socket_: SocketTcp, recv_buffer_: memoryview) -> bool:
+            """
+            Receives the file the server is sending us on transfer_socket_
+            and writes it to local_path_.
+            Returns False if the transfer is compromised.
+            """
+            nonlocal tot_bytes, n_files
 
-                    errors += get_next_resp.get("errors")
+            fname_ = finfo_.get("name")
+            fsize_ = finfo_.get("size")
+            fmtime_ = finfo_.get("mtime")
 
-                    # All the errors will be reported at the end
-                    continue
-                else:
-                    raise CommandExecutionError(ClientErrors.UNEXPECTED_SERVER_RESPONSE)
-
-            # else: file already put into the transfer socket
+            progressor = None
 
             # At this point the server is sending us the file
             if not quiet:
                 progressor = FileProgressor(
-                    fsize,
-                    description="GET " + fname,
+                    fsize_,
+                    description="GET " + fname_,
                     color_progress=PROGRESS_COLOR,
                     color_success=SUCCESS_COLOR,
                     color_error=ERROR_COLOR
                 )
 
-            log.i(f"Will write {local_path}")
-            f = local_path.open("wb")
+            log.i(f"Will write {local_path_}")
+            f = local_path_.open("wb")
 
             cur_pos = 0
             expected_crc = 0
 
-            while cur_pos < fsize:
-                # Receive next chunk
-                recv_size = min(chunk_size or BEST_BUFFER_SIZE, fsize - cur_pos)
+            while cur_pos < fsize_:
+                # Receive next chunk, directly into the buffer
+                chunk_len = min(len(recv_buffer_), fsize_ - cur_pos)
                 log.h("Waiting chunk...")
 
-                chunk = transfer_socket.recv(recv_size)
+                chunk = recv_buffer_[:chunk_len]
 
-                if not chunk:
+                if transfer_socket_.readinto(chunk, trace=False) < chunk_len:
                     log.i("END OF FILE")
                     raise CommandExecutionError()
 
-                chunk_len = len(chunk)
-
                 log.h(f"Received chunk of {chunk_len}B")
                 # Write next chunk
                 written_chunk_len = f.write(chunk)
 
                 if chunk_len != written_chunk_len:
                     log.e("Written less bytes than expected; file will probably be corrupted")
-                    return # Really don't know how to recover from this disaster
+                    return False # Really don't know how to recover from this disaster
 
                 cur_pos += chunk_len
-                tot_bytes += chunk_len
 
                 if do_check:
                     # Eventually update the CRC
@@ -1590,37 +1557,364 @@ class Client:
                     progressor.update(cur_pos)
 
 
-            log.i(f"DONE {fname}")
+            log.i(f"DONE {fname_}")
             log.d(f"- crc = {expected_crc}")
 
             f.close()
 
+            with transfer_lock:
+                tot_bytes += cur_pos
+
             # Adjust the mtime based on the remote
-            log.d(f"Setting mtime = {fmtime}")
-            set_mtime(local_path, fmtime, round_up=True)
+            log.d(f"Setting mtime = {fmtime_}")
+            set_mtime(local_path_, fmtime_, round_up=True)
 
             # Eventually do CRC check
             if do_check:
                 # CRC check on the received bytes
-                crc = btoi(transfer_socket.recv(4))
+                crc = btoi(transfer_socket_.recv(4))
                 if expected_crc != crc:
                     log.e(f"Wrong CRC; transfer failed. expected={expected_crc} | written={crc}")
-                    return # Really don't know how to recover from this disaster
+                    return False # Really don't know how to recover from this disaster
                 else:
                     log.d("CRC check: OK")
 
                 # Length check on the written file
-                written_size = local_path.stat().st_size
-                if written_size != fsize:
-                    log.e(f"File length mismatch; transfer failed. expected={fsize} ; written={written_size}")
-                    return # Really don't know how to recover from this disaster
+                written_size = local_path_.stat().st_size
+                if written_size != fsize_:
+                    log.e(f"File length mismatch; transfer failed. expected={fsize_} ; written={written_size}")
+                    return False # Really don't know how to recover from this disaster
                 else:
                     log.d("File length check: OK")
 
-            n_files += 1
+            with transfer_lock:
+                n_files += 1
+
             if not quiet:
                 progressor.success()
 
+            return True
+
+        def decide_range(finfo_: FileInfo) -> Tuple[str, Optional[Path]]:
+            """
+            Decides what to do with a range of a split file.
+            The decision is taken (as decide_next() does) only for the
+            first range announced of the file, and is the same for the others.
+            If the file has to be transferred, it is opened and sized now,
+            so that the ranges can be written in place in any order.
+            """
+            fname_ = finfo_.get("name")
+
+            split_file = split_files.get(fname_)
+
+            if not split_file:
+                action_, local_path_ = decide_next(finfo_)
+
+                fd_ = None
+
+                if action_ == RequestsParams.GET_NEXT_ACTION_TRANSFER:
+                    log.i(f"Will write {local_path_} in ranges")
+                    fd_ = os.open(local_path_, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+                    os.ftruncate(fd_, finfo_.get("size"))
+
+                split_file = SplitFile(action_, local_path_, fd_, finfo_.get("size"))
+                split_files[fname_] = split_file
+
+            return split_file.action, split_file.local_path
+
+        def receive_range(finfo_: FileInfo, frange_: Tuple[int, int],
+                          transfer_socket_: SocketTcp, recv_buffer_: memoryview) -> bool:
+            """
+            Receives a range of a split file the server is sending us
+            on transfer_socket_ and writes it in place with pwrite().
+            Returns False if the transfer is compromised.
+            """
+            nonlocal tot_bytes
+
+            split_file = split_files[finfo_.get("name")]
+            offset_, length_ = frange_
+
+            cur_pos = 0
+            expected_crc = 0
+
+            while cur_pos < length_:
+                # Receive next chunk, directly into the buffer
+                chunk_len = min(len(recv_buffer_), length_ - cur_pos)
+
+                chunk = recv_buffer_[:chunk_len]
+
+                if transfer_socket_.readinto(chunk, trace=False) < chunk_len:
+                    log.i("END OF FILE")
+                    raise CommandExecutionError()
+
+                # Write next chunk at its offset
+                written_chunk_len = os.pwrite(split_file.fd, chunk, offset_ + cur_pos)
+
+                if chunk_len != written_chunk_len:
+                    log.e("Written less bytes than expected; file will probably be corrupted")
+                    return False # Really don't know how to recover from this disaster
+
+                cur_pos += chunk_len
+
+                if do_check:
+                    # Eventually update the CRC
+                    expected_crc = zlib.crc32(chunk, expected_crc)
+
+            log.i(f"DONE {finfo_.get('name')} [{offset_}-{offset_ + length_}]")
+
+            with transfer_lock:
+                tot_bytes += cur_pos
+
+            # Eventually do CRC check
+            if do_check:
+                # CRC check on the received bytes
+                crc = btoi(transfer_socket_.recv(4))
+                if expected_crc != crc:
+                    log.e(f"Wrong CRC; transfer failed. expected={expected_crc} | written={crc}")
+                    return False # Really don't know how to recover from this disaster
+                else:
+                    log.d("CRC check: OK")
+
+            finish_range(finfo_, frange_)
+
+            return True
+
+        def finish_range(finfo_: FileInfo, frange_: Tuple[int, int], failed: bool = False):
+            """
+            Accounts a range of a split file as handled (either
+            received or failed), closing the file after the last one.
+            """
+            nonlocal n_files
+
+            split_file = split_files[finfo_.get("name")]
+
+            with transfer_lock:
+                split_file.remaining -= frange_[1]
+                split_file.failed = split_file.failed or failed
+
+                if split_file.remaining > 0:
+                    return
+
+                if not split_file.failed:
+                    n_files += 1
+
+            # Last range of the file
+            os.close(split_file.fd)
+
+            # Adjust the mtime based on the remote
+            log.d(f"Setting mtime = {finfo_.get('mtime')}")
+            set_mtime(split_file.local_path, finfo_.get("mtime"), round_up=True)
+
+        def get_pipelined(conn_: ConnectionMinimal, recv_buffer_: memoryview) -> Optional[Response]:
+            """
+            Pipelined GET over conn_.
+            The server announces up to 'window' files ahead; we answer
+            to each announcement as soon as it arrives with either
+            transfer or skip, and then receive the data of the accepted
+            files in the same order of the announcements.
+            We keep exactly 'window' pending announcements, as the server
+            does, so that both the sides know what comes next on the stream.
+            Returns the outcome response if it has already been read (abort).
+            """
+            nonlocal errors
+
+            transfer_socket_ = conn_._stream._socket
+
+            pending: Deque[Tuple[FileInfo, str, Optional[Path], Optional[Tuple[int, int]]]] = deque([])
+            ended = False
+            aborting = False
+
+            def receive_next_announcement():
+                nonlocal ended, aborting, transfer_aborted
+
+                announcement = conn_.read_json()
+                ensure_success_response(announcement)
+
+                announcement_data = announcement.get("data")
+                finfo_ = announcement_data.get(ResponsesParams.GET_NEXT_FILE) \
+                    if announcement_data else None
+
+                if not finfo_:
+                    log.i("Nothing more to GET")
+                    ended = True
+                    return
+
+                # Range of a split file
+                frange_ = announcement_data.get(ResponsesParams.GET_NEXT_RANGE)
+
+                with transfer_lock:
+                    if transfer_aborted:
+                        # Aborted over another data connection
+                        action_, local_path_ = RequestsParams.GET_NEXT_ACTION_ABORT, None
+                    elif frange_:
+                        action_, local_path_ = decide_range(finfo_)
+                    else:
+                        action_, local_path_ = decide_next(finfo_)
+
+                log.i(f"Sending '{action_}' message for '{finfo_.get('name')}'")
+                conn_.write_json({
+                    RequestsParams.GET_NEXT_ACTION: action_
+                })
+
+                if action_ == RequestsParams.GET_NEXT_ACTION_ABORT:
+                    aborting = True
+                    transfer_aborted = True
+
+                pending.append((finfo_, action_, local_path_, frange_))
+
+            while not ended and not aborting and len(pending) < window:
+                receive_next_announcement()
+
+            while pending:
+                finfo, action, local_path, frange = pending.popleft()
+
+                if action == RequestsParams.GET_NEXT_ACTION_ABORT:
+                    # The server will stop here; what remains on the stream
+                    # are only the announcements already sent and the outcome
+                    log.d("Discarding announcements until the outcome")
+                    while True:
+                        remaining_resp = conn_.read_json()
+                        if (remaining_resp.get("data") or {}).get(ResponsesParams.GET_OUTCOME) is not None:
+                            return remaining_resp
+
+                if action == RequestsParams.GET_NEXT_ACTION_TRANSFER:
+                    # The server may say the transfer can't be done actually (e.g. EPERM)
+                    transfer_resp = conn_.read_json()
+
+                    if is_success_response(transfer_resp):
+                        log.d("Transfer can actually begin")
+                        if frange:
+                            received = receive_range(finfo, frange, transfer_socket_, recv_buffer_)
+                        else:
+                            received = receive_next(finfo, local_path, transfer_socket_, recv_buffer_)
+                        if not received:
+                            raise CommandExecutionError()
+                    elif is_error_response(transfer_resp):
+                        log.w("Transfer cannot be initialized due to remote error")
+                        # All the errors will be reported at the end
+                        with transfer_lock:
+                            errors += transfer_resp.get("errors")
+                        if frange:
+                            finish_range(finfo, frange, failed=True)
+                    else:
+                        raise CommandExecutionError(ClientErrors.UNEXPECTED_SERVER_RESPONSE)
+
+                if not ended and not aborting:
+                    receive_next_announcement()
+
+            return None
+
+        def get_attached(data_conn: ConnectionMinimal):
+            """ Pipelined GET over a data connection attached to the transfer """
+            data_outcome_resp = get_pipelined(data_conn, memoryview(bytearray(len(recv_buffer))))
+
+            if not data_outcome_resp:
+                data_outcome_resp = data_conn.read_json()
+
+            ensure_data_response(data_outcome_resp, ResponsesParams.GET_OUTCOME)
+
+        # Actual GET request is here
+        resp = conn.get(files,
+                        check=do_check, no_hidden=no_hidden,
+                        mmap=use_mmap, chunk_size=chunk_size,
+                        window=window, parallel=parallel, split=split_size)
+        ensure_success_response(resp)
+
+        # The server tells us whether it will pipeline (i.e. announce files
+        # ahead without waiting for next() requests) and whether
+        # we can attach data connections to the transfer
+        resp_data = resp.get("data") or {}
+        window = resp_data.get(ResponsesParams.GET_WINDOW, 0)
+        transfer_token = resp_data.get(ResponsesParams.GET_TOKEN)
+
+        if transfer_token:
+            # Parallel GET: the files are spread over the data connections
+            self._transfer_parallel(conn, transfer_token,
+                                    resp_data.get(ResponsesParams.GET_PARALLEL),
+                                    get_attached)
+        elif window:
+            # Pipelined GET
+            outcome_resp = get_pipelined(conn, recv_buffer)
+        else:
+            while True:
+                # The first next() fetch never implies a new file to be put
+                # on the transfer socket.
+                # We have to check whether we want to eventually overwrite
+                # the file, and then tell the server next() if
+                # 1. Really transfer the file
+                # 2. Skip the file
+
+                # If OverwritePolicy.YES transfer immediately since we won't
+                # ask to the user whether overwrite or not.
+                # The only exception is if preview is True, in that case we won't
+                # perform the transfer so do a regular seek
+
+                if overwrite_policy == OverwritePolicy.YES and not preview:
+                    action = RequestsParams.GET_NEXT_ACTION_TRANSFER
+                else:
+                    action = RequestsParams.GET_NEXT_ACTION_SEEK
+
+                log.i(f"Sending '{action}' message")
+
+                get_next_resp = conn.call({
+                    RequestsParams.GET_NEXT_ACTION: action
+                })
+
+                ensure_success_response(get_next_resp)
+                data = get_next_resp.get("data")
+
+                finfo: Optional[FileInfo] = None
+
+                if data:
+                    finfo = data.get(ResponsesParams.GET_NEXT_FILE)
+
+                if not finfo:
+                    log.i("Nothing more to GET")
+                    if data and data.get(ResponsesParams.GET_OUTCOME) is not None:
+                        outcome_resp = get_next_resp
+                    break
+
+                next_action, local_path = decide_next(finfo)
+
+                if next_action == RequestsParams.GET_NEXT_ACTION_ABORT:
+                    conn.write_json({
+                        RequestsParams.GET_NEXT_ACTION: RequestsParams.GET_NEXT_ACTION_ABORT
+                    })
+                    break
+
+                if finfo.get("ftype") != FTYPE_FILE:
+                    continue  # No FTYPE_FILE => neither skip nor transfer for next()
+
+                if action == RequestsParams.GET_NEXT_ACTION_SEEK:
+                    if next_action == RequestsParams.GET_NEXT_ACTION_SKIP:
+                        ensure_success_response(conn.call({
+                            RequestsParams.GET_NEXT_ACTION: RequestsParams.GET_NEXT_ACTION_SKIP
+                        }))
+                        continue
+
+                    # Regular case, we did a seek and now tell the server to transfer
+                    get_next_resp = conn.call({
+                        RequestsParams.GET_NEXT_ACTION: RequestsParams.GET_NEXT_ACTION_TRANSFER
+                    })
+
+                    # The server may say the transfer can't be done actually (e.g. EPERM)
+                    if is_success_response(get_next_resp):
+                        log.d("Transfer can actually begin")
+                    elif is_error_response(get_next_resp):
+                        log.w("Transfer cannot be initialized due to remote error")
+
+                        errors += get_next_resp.get("errors")
+
+                        # All the errors will be reported at the end
+                        continue
+                    else:
+                        raise CommandExecutionError(ClientErrors.UNEXPECTED_SERVER_RESPONSE)
+
+                # else: file already put into the transfer socket
+
+                if not receive_next(finfo, local_path, transfer_socket, recv_buffer):
+                    return
+
         # Wait for completion
         if not outcome_resp:
             log.d("Waiting for completion from remote...")
@@ -1716,15 +2010,18 @@ class Client:
             files += self._local_paths(p)
 
         class SendFile:
-            def __init__(self, local_path: Path, remote_path: Path, do_sync: bool):
+            def __init__(self, local_path: Path, remote_path: Path, do_sync: bool,
+                         frange: Optional[Tuple[int, int]] = None):
                 self.local_path = local_path
                 self.remote_path = remote_path
                 self.do_sync = do_sync
+                self.frange = frange
 
             def __str__(self):
                 return f"(local='{self.local_path}', " \
                        f"remote='{self.remote_path}', " \
-                       f"sync={self.do_sync})"
+                       f"sync={self.do_sync}, " \
+                       f"range={self.frange})"
 
         sendfiles: Deque[SendFile] = deque([])
 
@@ -1742,6 +2039,15 @@ class Client:
 
         chunk_size = args.get_option_param(Put.CHUNK_SIZE, BEST_BUFFER_SIZE)
         use_mmap = args.get_option_param(Put.MMAP)
+        window = args.get_option_param(Put.WINDOW, DEFAULT_TRANSFER_WINDOW)
+        parallel = args.get_option_param(Put.PARALLEL, 0)
+        split_size = args.get_option_param(Put.SPLIT_SIZE, DEFAULT_TRANSFER_SPLIT_SIZE) \
+            if not preview else 0
+
+        if parallel:
+            # The progress of concurrent transfers can't be shown
+            # on a single line
+            quiet = True
 
         transfer_socket = conn._stream._socket
 
@@ -1778,10 +2084,28 @@ class Client:
         # Errors
         errors = []
 
+        # Guards the shared state while transferring
+        # over more data connections
+        transfer_lock = threading.Lock()
+        transfer_aborted = False
+
+        # Overwrite decisions taken for the split files (by local path),
+        # so that the user is asked only once for all the ranges
+        split_decisions: Dict[str, Tuple[str, FileInfo]] = {}
+
         resp = conn.put(check=do_check, preview=preview,
-                        dest=dest, is_multiple= True if len(files) > 1 else False)
+                        dest=dest, is_multiple= True if len(files) > 1 else False,
+                        window=window, parallel=parallel, split=split_size)
         ensure_success_response(resp)
 
+        # The server tells us whether it accepts file infos ahead,
+        # whether we can attach data connections to the transfer
+        # and whether it accepts ranges of the files
+        resp_data = resp.get("data") or {}
+        window = resp_data.get(ResponsesParams.PUT_WINDOW, 0)
+        transfer_token = resp_data.get(ResponsesParams.PUT_TOKEN)
+        split = resp_data.get(ResponsesParams.PUT_SPLIT, 0) if transfer_token else 0
+
 
         for p in files:
             # STANDARD CASE
@@ -1809,27 +2133,23 @@ class Client:
             log.i(f"Adding sendfile {sendfile}")
             sendfiles.appendleft(sendfile)
 
-        def send_file(sendfile: SendFile):
-            nonlocal overwrite_policy
-            nonlocal tot_bytes
-            nonlocal n_files
-            nonlocal errors
-            nonlocal preview_total_size
-
-            progressor = None
-
+        def prepare_sendfile(sendfile: SendFile) -> Optional[Tuple[FileInfo, Optional[BinaryIO]]]:
+            """
+            Creates the file info for the local file (with the remote path as name)
+            and, for files, opens it. Returns None if the file can't be sent.
+            """
             # Create the file info for the local file, but set the
             # remote path as name
             finfo = create_file_info(sendfile.local_path, name=str(sendfile.remote_path))
 
             if not finfo:
-                return True
+                return None
 
             log.i(f"send_file finfo: {j(finfo)}")
-            fsize = finfo.get("size")
-            ftype = finfo.get("ftype")
 
-            if ftype == FTYPE_FILE:
+            local_fd = None
+
+            if finfo.get("ftype") == FTYPE_FILE:
                 # Case: FILE => try to open the file and then transfer
 
                 # Before invoke next(), try to open the file for real.
@@ -1843,33 +2163,144 @@ class Client:
                 except FileNotFoundError:
                     errors.append(create_error_of_response(ClientErrors.NOT_EXISTS,
                                                              q(sendfile.local_path)))
-                    return True
+                    return None
                 except PermissionError:
                     errors.append(create_error_of_response(ClientErrors.PERMISSION_DENIED,
                                                              q(sendfile.local_path)))
-                    return True
+                    return None
                 except OSError as oserr:
                     errors.append(create_error_of_response(ClientErrors.GENERAL_ERROR,
                                                            os_error_str(oserr),
                                                             q(sendfile.local_path)))
-                    return True
+                    return None
                 except Exception as exc:
                     errors.append(create_error_of_response(ClientErrors.GENERAL_ERROR,
                                                            exc,
                                                            q(sendfile.local_path)))
-                    return True
+                    return None
 
-            log.d("doing a put_next")
+            return finfo, local_fd
 
-            put_next_resp = conn.call({
-                RequestsParams.PUT_NEXT_FILE: finfo,
-                RequestsParams.PUT_NEXT_OVERWRITE: overwrite_policy,
-                RequestsParams.PUT_NEXT_SYNC: sendfile.do_sync
-            })
+        def next_sendfile() -> Optional[Tuple[SendFile, FileInfo, Optional[BinaryIO]]]:
+            """
+            Pops the sendfiles (expanding the directories) until
+            one that have to be told to the server is found.
+            Returns None if there is nothing more to send.
+            """
+            while sendfiles:
+                log.i("Putting another file info")
+                sendfile = sendfiles.pop()
+
+                # Check what is this
+                # 1. Non existing: skip
+                # 2. Hidden: skip if is_hidden = True
+                # 2. A file: send it directly (parent dirs won't be replicated)
+                # 3. A dir: send it recursively
+
+                prepared = None
+
+                if no_hidden and is_hidden(sendfile.local_path):
+                    log.d(f"Not sending {sendfile.local_path} since no_hidden is True")
+                elif sendfile.local_path.is_file():
+                    # Send it directly
+                    log.d("-> is a FILE")
+
+                    fsize = sendfile.local_path.stat().st_size if split and not sendfile.frange else 0
+
+                    if split and fsize > split:
+                        # Big file: split it in ranges that are
+                        # spread over the data connections
+                        log.i(f"Splitting {sendfile.local_path} in ranges of {split}")
+
+                        for offset in reversed(range(0, fsize, split)):
+                            # do_sync is kept only by the first range
+                            range_sendfile = SendFile(
+                                local_path=sendfile.local_path,
+                                remote_path=sendfile.remote_path,
+                                do_sync=sendfile.do_sync if offset == 0 else False,
+                                frange=(offset, min(split, fsize - offset)))
+                            log.i(f"Adding sendfile {range_sendfile}")
+                            sendfiles.append(range_sendfile)
+                        continue
+
+                    prepared = prepare_sendfile(sendfile)
+                elif sendfile.local_path.is_dir():
+                    # Send it recursively
+
+                    log.d("-> is a DIR")
+
+                    try:
+                        dir_files: List[Path] = sorted(list(sendfile.local_path.iterdir()),
+                                                       reverse=False)
+                    except FileNotFoundError:
+                        errors.append(create_error_of_response(ClientErrors.NOT_EXISTS,
+                                                                 q(sendfile.local_path)))
+                        continue
+                    except PermissionError:
+                        errors.append(create_error_of_response(ClientErrors.PERMISSION_DENIED,
+                                                                 q(sendfile.local_path)))
+                        continue
+                    except OSError as oserr:
+                        errors.append(create_error_of_response(ClientErrors.GENERAL_ERROR,
+                                                               os_error_str(oserr),
+                                                                q(sendfile.local_path)))
+                        continue
+                    except Exception as exc:
+                        errors.append(create_error_of_response(ClientErrors.GENERAL_ERROR,
+                                                               exc,
+                                                               q(sendfile.local_path)))
+                        continue
+
+
+                    # Directory found
+                    if sendfile.do_sync or not dir_files:
+                        log.d(f"Sending the directory finfo anyway since "
+                              f"{'sync is True' if sendfile.do_sync else ' directory is empty'}")
+                        prepared = prepare_sendfile(sendfile)
+
+                    if dir_files:
+                        # standard case
+                        log.i("Found a filled directory: adding all inner files to remaining_files")
+                        for file_in_dir in dir_files:
+                            # do_sync is always False, only the top directory has it = True
+                            child_sendfile = SendFile(
+                                local_path=file_in_dir,
+                                remote_path=sendfile.remote_path / file_in_dir.name,
+                                do_sync=False)
+                            log.i(f"Adding sendfile {child_sendfile}")
+                            sendfiles.appendleft(child_sendfile)
+                else:
+                    log.w(f"Failed to send '{sendfile.local_path}': unknown file type, doing nothing")
+
+                if prepared:
+                    return (sendfile, *prepared)
+
+            return None
+
+        def handle_put_next_response(
+                sendfile: SendFile, finfo: FileInfo, local_fd: Optional[BinaryIO],
+                put_next_resp: Response,
+                resolve_uncertain: Callable[[str, FileInfo, FileInfo], Optional[Response]],
+                transfer_socket_: SocketTcp) -> bool:
+            """
+            Handles the response of the server to the file info of
+            sendfile and eventually sends the file on transfer_socket_.
+            resolve_uncertain is invoked with the decision of the user
+            if the server is uncertain about the file, and must return
+            the new response (or None if the file has to be skipped).
+            Returns whether go ahead with the next files.
+            """
+            nonlocal overwrite_policy
+            nonlocal errors
+            nonlocal preview_total_size
+
+            fsize = finfo.get("size")
+            ftype = finfo.get("ftype")
 
             if is_error_response(put_next_resp):
                 log.w("Received error response for put_next()")
-                errors += put_next_resp.get(ResponsesParams.PUT_ERRORS)
+                with transfer_lock:
+                    errors += put_next_resp.get(ResponsesParams.PUT_ERRORS)
                 # All the errors will be reported at the end
                 return put_next_resp.get(ResponsesParams.PUT_ABORT, False) == False
 
@@ -1906,30 +2337,39 @@ class Client:
 
                 remote_finfo = put_next_resp.get("data").get(ResponsesParams.PUT_NEXT_FILE_INFO)
 
-                timer.stop() # Don't take the user time into account
-                current_overwrite_decision, overwrite_policy = self._ask_overwrite(
-                    local_info=finfo,
-                    remote_info=remote_finfo,
-                    current_policy=overwrite_policy
-                )
-                timer.start()
+                with transfer_lock:
+                    split_decision = split_decisions.get(str(sendfile.local_path)) \
+                        if sendfile.frange else None
+
+                    if split_decision:
+                        # Already asked for another range of the file:
+                        # take the same decision (against the same remote file)
+                        current_overwrite_decision, remote_finfo = split_decision
+                    else:
+                        timer.stop() # Don't take the user time into account
+                        current_overwrite_decision, overwrite_policy = self._ask_overwrite(
+                            local_info=finfo,
+                            remote_info=remote_finfo,
+                            current_policy=overwrite_policy
+                        )
+                        timer.start()
+
+                        if sendfile.frange:
+                            split_decisions[str(sendfile.local_path)] = \
+                                (current_overwrite_decision, remote_finfo)
+
+                put_next_resp = resolve_uncertain(current_overwrite_decision, finfo, remote_finfo)
 
-                if current_overwrite_decision == OverwritePolicy.NO:
+                if not put_next_resp:
                     log.i(f"Skipping {sendfile.remote_path}")
                     return True
 
-                # If overwrite policy is NEWER or YES we have to tell it
-                # to the server so that it will take the right action
-                put_next_resp = conn.call({
-                    RequestsParams.PUT_NEXT_FILE: finfo,
-                    RequestsParams.PUT_NEXT_OVERWRITE: current_overwrite_decision
-                })
-
                 if is_success_response(put_next_resp):
                     log.d("Transfer can actually begin")
                 elif is_error_response(put_next_resp):
                     log.w("Transfer cannot be initialized due to remote error")
-                    errors += put_next_resp.get("errors")
+                    with transfer_lock:
+                        errors += put_next_resp.get("errors")
                     # All the errors will be reported at the end
                     return True
                 else:
@@ -1956,9 +2396,24 @@ class Client:
             if preview:
                 # Just a preview, nothing to transfer
                 print(green(f"+ [{size_str_justify(fsize)}] {sendfile.remote_path}"))
-                preview_total_size += fsize
+                with transfer_lock:
+                    preview_total_size += fsize
                 return True
 
+            send_file(sendfile, finfo, local_fd, transfer_socket_)
+
+            return True
+
+        def send_file(sendfile: SendFile, finfo: FileInfo, local_fd: BinaryIO,
+                      transfer_socket_: SocketTcp):
+            nonlocal tot_bytes
+            nonlocal n_files
+
+            progressor = None
+
+            # Eventually send only a range of the file
+            offset, fsize = sendfile.frange or (0, finfo.get("size"))
+
             if not quiet:
                 progressor = FileProgressor(
                     fsize,
@@ -1979,6 +2434,9 @@ class Client:
                 except Exception as ex:
                     log.w(f"mmap failed, will read directly from file for reason: {ex}")
 
+            if offset:
+                source.seek(offset)
+
             cur_pos = 0
             crc = 0
 
@@ -1998,10 +2456,9 @@ class Client:
                     log.i(f"Finished {sendfile.local_path}")
                     break
 
-                transfer_socket.send(chunk)
+                transfer_socket_.send(chunk)
 
                 cur_pos += chunk_len
-                tot_bytes += chunk_len
                 if not quiet:
                     progressor.update(cur_pos)
 
@@ -2009,93 +2466,171 @@ class Client:
             log.d(f"- crc = {crc}")
 
             if do_check:
-                transfer_socket.send(itob(crc, 4))
+                transfer_socket_.send(itob(crc, 4))
 
             local_fd.close()
             if source != local_fd:
                 source.close() # mmap
 
-            n_files += 1
+            with transfer_lock:
+                tot_bytes += cur_pos
+                if not offset:
+                    # Count split files only once
+                    n_files += 1
+
             if not quiet:
                 progressor.success()
 
-            return True
+        def put_next_request(sendfile: SendFile, finfo: FileInfo) -> Dict:
+            req = {
+                RequestsParams.PUT_NEXT_FILE: finfo,
+                RequestsParams.PUT_NEXT_OVERWRITE: overwrite_policy,
+                RequestsParams.PUT_NEXT_SYNC: sendfile.do_sync
+            }
 
+            if sendfile.frange:
+                req[RequestsParams.PUT_NEXT_RANGE] = sendfile.frange
 
-        while sendfiles:
-            log.i("Putting another file info")
-            next_sendfile = sendfiles.pop()
+            return req
 
-            # Check what is this
-            # 1. Non existing: skip
-            # 2. Hidden: skip if is_hidden = True
-            # 2. A file: send it directly (parent dirs won't be replicated)
-            # 3. A dir: send it recursively
+        def put_pipelined(conn_: ConnectionMinimal):
+            """
+            Pipelined PUT over conn_.
+            Send up to 'window' file infos ahead, without waiting for the
+            responses; then handle the responses (and send the data of the
+            accepted files) in the same order of the infos.
+            We keep exactly 'window' pending infos, as the server
+            does, so that both the sides know what comes next on the stream.
+            """
+            nonlocal transfer_aborted
 
-            go_ahead = True
+            transfer_socket_ = conn_._stream._socket
 
-            if no_hidden and is_hidden(next_sendfile.local_path):
-                log.d(f"Not sending {next_sendfile.local_path} since no_hidden is True")
-            elif next_sendfile.local_path.is_file():
-                # Send it directly
-                log.d("-> is a FILE")
-                go_ahead = send_file(next_sendfile)
-            elif next_sendfile.local_path.is_dir():
-                # Send it recursively
+            pending: Deque[Optional[Tuple[SendFile, FileInfo, Optional[BinaryIO]]]] = deque([])
+            done = False
 
-                log.d("-> is a DIR")
+            def send_next_info():
+                nonlocal done
 
-                try:
-                    dir_files: List[Path] = sorted(list(next_sendfile.local_path.iterdir()),
-                                                   reverse=False)
-                except FileNotFoundError:
-                    errors.append(create_error_of_response(ClientErrors.NOT_EXISTS,
-                                                             q(next_sendfile.local_path)))
-                    continue
-                except PermissionError:
-                    errors.append(create_error_of_response(ClientErrors.PERMISSION_DENIED,
-                                                             q(next_sendfile.local_path)))
-                    continue
-                except OSError as oserr:
-                    errors.append(create_error_of_response(ClientErrors.GENERAL_ERROR,
-                                                           os_error_str(oserr),
-                                                            q(next_sendfile.local_path)))
-                    continue
-                except Exception as exc:
-                    errors.append(create_error_of_response(ClientErrors.GENERAL_ERROR,
-                                                           exc,
-                                                           q(next_sendfile.local_path)))
-                    continue
+                with transfer_lock:
+                    next_send = next_sendfile() if not transfer_aborted else None
 
+                if not next_send:
+                    log.i("Sending DONE")
+                    conn_.write_json({})
+                    pending.append(None)
+                    done = True
+                    return
 
-                # Directory found
-                if next_sendfile.do_sync or not dir_files:
-                    log.d(f"Sending the directory finfo anyway since "
-                          f"{'sync is True' if next_sendfile.do_sync else ' directory is empty'}")
-                    go_ahead = send_file(next_sendfile)
-
-                if dir_files:
-                    # standard case
-                    log.i("Found a filled directory: adding all inner files to remaining_files")
-                    for file_in_dir in dir_files:
-                        # do_sync is always False, only the top directory has it = True
-                        child_sendfile = SendFile(
-                            local_path=file_in_dir,
-                            remote_path=next_sendfile.remote_path / file_in_dir.name,
-                            do_sync=False)
-                        log.i(f"Adding sendfile {child_sendfile}")
-                        sendfiles.appendleft(child_sendfile)
-            else:
-                log.w(f"Failed to send '{next_sendfile.local_path}': unknown file type, doing nothing")
+                log.d("doing a put_next")
+                conn_.write_json(put_next_request(next_send[0], next_send[1]))
+                pending.append(next_send)
 
-            if not go_ahead:
-                log.w("Aborting since remote ask us to do so")
-                break
+            def resolve_uncertain_pipelined(decision: str,
+                                            local_finfo: FileInfo,
+                                            remote_finfo: FileInfo) -> Optional[Response]:
+                # The server is waiting for a plain yes/no: take the
+                # decision about newer/size now
+                will_accept = decision == OverwritePolicy.YES
+
+                if decision in OverwritePolicy.NEWERS:
+                    will_accept = will_accept or is_newer(local_finfo.get("mtime"), remote_finfo.get("mtime"))
 
-        log.i("Sending DONE")
+                if decision in OverwritePolicy.DIFF_SIZES:
+                    will_accept = will_accept or local_finfo.get("size") != remote_finfo.get("size")
+
+                conn_.write_json({
+                    RequestsParams.PUT_NEXT_OVERWRITE:
+                        OverwritePolicy.YES if will_accept else OverwritePolicy.NO
+                })
+
+                if not will_accept:
+                    return None
+
+                return create_success_response({
+                    ResponsesParams.PUT_NEXT_STATUS: ResponsesParams.PUT_NEXT_STATUS_ACCEPTED
+                })
 
-        put_done_resp = conn.call({})
-        ensure_success_response(put_done_resp)
+            while not done and len(pending) < window:
+                send_next_info()
+
+            while pending:
+                pending_send = pending.popleft()
+
+                put_next_resp = conn_.read_json()
+
+                if not pending_send:
+                    # Response to DONE
+                    ensure_success_response(put_next_resp)
+                    break
+
+                sendfile, finfo, local_fd = pending_send
+
+                go_ahead = handle_put_next_response(sendfile, finfo, local_fd, put_next_resp,
+                                                    resolve_uncertain_pipelined, transfer_socket_)
+
+                if local_fd and not local_fd.closed:
+                    local_fd.close()
+
+                if not go_ahead:
+                    log.w("Aborting since remote ask us to do so")
+                    transfer_aborted = True
+
+                if not done:
+                    send_next_info()
+
+        def put_attached(data_conn: ConnectionMinimal):
+            """ Pipelined PUT over a data connection attached to the transfer """
+            put_pipelined(data_conn)
+
+            ensure_data_response(data_conn.read_json(), ResponsesParams.PUT_OUTCOME)
+
+        if transfer_token:
+            # Parallel PUT: the files are spread over the data connections
+            self._transfer_parallel(conn, transfer_token,
+                                    resp_data.get(ResponsesParams.PUT_PARALLEL),
+                                    put_attached)
+        elif window:
+            # Pipelined PUT
+            put_pipelined(conn)
+        else:
+            def resolve_uncertain(decision: str, local_finfo: FileInfo, _: FileInfo) -> Optional[Response]:
+                if decision == OverwritePolicy.NO:
+                    return None
+
+                # If overwrite policy is NEWER or YES we have to tell it
+                # to the server so that it will take the right action
+                return conn.call({
+                    RequestsParams.PUT_NEXT_FILE: local_finfo,
+                    RequestsParams.PUT_NEXT_OVERWRITE: decision
+                })
+
+            while True:
+                next_send = next_sendfile()
+
+                if not next_send:
+                    break
+
+                sendfile, finfo, local_fd = next_send
+
+                log.d("doing a put_next")
+
+                put_next_resp = conn.call(put_next_request(sendfile, finfo))
+
+                go_ahead = handle_put_next_response(sendfile, finfo, local_fd, put_next_resp,
+                                                    resolve_uncertain, transfer_socket)
+
+                if local_fd and not local_fd.closed:
+                    local_fd.close()
+
+                if not go_ahead:
+                    log.w("Aborting since remote ask us to do so")
+                    break
+
+            log.i("Sending DONE")
+
+            put_done_resp = conn.call({})
+            ensure_success_response(put_done_resp)
 
         # Wait for completion
         outcome_resp = conn.read_json()
@@ -3206,6 +3741,48 @@ NNSS  : only if newer OR size is different - to all
 
         return cur_decision, new_default
 
+    @classmethod
+    def _transfer_parallel(cls,
+                           conn: ConnectionMinimal, token: str, parallel: int,
+                           transfer: Callable[[ConnectionMinimal], None]):
+        """
+        Opens 'parallel' data connections to the server of 'conn',
+        attaches them to the transfer identified by 'token' and
+        runs 'transfer' over each of them, in its own thread.
+        When all of them are finished tells the server through 'conn'
+        and raises the first exception occurred, if any.
+        """
+        failures = []
+
+        def transfer_attached():
+            data_conn = None
+            try:
+                data_conn = ConnectionMinimal(conn.server_ip(), conn.server_port(), conn.server_ssl())
+                ensure_success_response(data_conn.attach(token))
+                transfer(data_conn)
+            except Exception as exc:
+                log.eexception(f"Transfer over data connection failed: {exc}")
+                failures.append(exc)
+            finally:
+                if data_conn:
+                    data_conn.destroy_connection(clean=False)
+
+        log.i(f"Transferring over {parallel} data connections")
+
+        transfer_threads = [threading.Thread(target=transfer_attached, daemon=True)
+                            for _ in range(parallel)]
+
+        for th in transfer_threads:
+            th.start()
+
+        for th in transfer_threads:
+            th.join()
+
+        conn.write_json({})
+
+        if failures:
+            raise failures[0]
+
     @classmethod
     def _discover(
             cls,
@@ -234,6 +234,13 @@ class ConnectionMinimal:
 
         return resp
 
+    def attach(self, token: str) -> Response:
+        # Data connection: authenticated by the token of the
+        # transfer opened on the main connection
+        return self.call(create_request(Requests.ATTACH, {
+            RequestsParams.ATTACH_TOKEN: token
+        }))
+
     @require_server_connection
     def disconnect(self) -> Response:
         resp = self.destroy_server_connection()
@@ -400,7 +407,10 @@ class ConnectionMinimal:
             check: bool,
             no_hidden: bool = False,
             mmap: Optional[bool] = None,
-            chunk_size: Optional[int] = None) -> Response:
+            chunk_size: Optional[int] = None,
+            window: Optional[int] = None,
+            parallel: Optional[int] = None,
+            split: Optional[int] = None) -> Response:
 
         req_params = {
             RequestsParams.GET_PATHS: paths,
@@ -408,6 +418,13 @@ class ConnectionMinimal:
             RequestsParams.GET_NO_HIDDEN: no_hidden,
         }
 
+        if window:
+            req_params[RequestsParams.GET_WINDOW] = window
+        if parallel:
+            req_params[RequestsParams.GET_PARALLEL] = parallel
+        if split:
+            req_params[RequestsParams.GET_SPLIT] = split
+
 
         # Secret params
         if mmap is not None:
@@ -421,13 +438,26 @@ class ConnectionMinimal:
     @require_sharing_connection
     def put(self, check: bool, preview: bool,
             dest: Optional[str] = None,
-            is_multiple: Optional[bool] = None) -> Response:
-        return self.call(create_request(Requests.PUT, {
+            is_multiple: Optional[bool] = None,
+            window: Optional[int] = None,
+            parallel: Optional[int] = None,
+            split: Optional[int] = None) -> Response:
+
+        req_params = {
             RequestsParams.PUT_CHECK: check,
             RequestsParams.PUT_PREVIEW: preview,
             RequestsParams.PUT_DEST: dest,
             RequestsParams.PUT_IS_MULTIPLE: is_multiple,
-        }))
+        }
+
+        if window:
+            req_params[RequestsParams.PUT_WINDOW] = window
+        if parallel:
+            req_params[RequestsParams.PUT_PARALLEL] = parallel
+        if split:
+            req_params[RequestsParams.PUT_SPLIT] = split
+
+        return self.call(create_request(Requests.PUT, req_params))
 
 
     # === INTERNALS ===
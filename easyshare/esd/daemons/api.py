@@ -1,5 +1,6 @@
 import mmap
 import os
+import secrets
 import threading
 import zlib
 from collections import OrderedDict, deque
@@ -8,7 +9,7 @@ from typing import List, Dict, Callable, Optional, Union, Tuple, BinaryIO, Deque
 
 from easyshare.auth import Auth
 from easyshare.common import TransferDirection, TransferProtocol, BEST_BUFFER_SIZE, APP_VERSION, \
-    DEFAULT_TRANSFER_SOCKET_TIMEOUT
+    DEFAULT_TRANSFER_SOCKET_TIMEOUT, MAX_TRANSFER_WINDOW, MAX_TRANSFER_PARALLEL
 from easyshare.endpoint import Endpoint
 from easyshare.esd.common import Sharing, ClientContext
 from easyshare.esd.daemons import TcpDaemon
@@ -60,6 +61,10 @@ class ApiDaemon(TcpDaemon):
         self._clients_lock = threading.Lock()
         self._clients: Dict[Endpoint, ClientHandler] = {}
 
+        # Transfers that data connections can be attached to
+        self._transfers_lock = threading.Lock()
+        self._transfers: Dict[str, Tuple[str, Callable[['ClientHandler'], Response]]] = {} # token -> ip, serve
+
     def sharings(self) -> Dict[str, Sharing]:
         return self._sharings
 
@@ -74,6 +79,31 @@ class ApiDaemon(TcpDaemon):
         """ Whether rexec is enabled """
         return self._rexec_enabled
 
+    def add_transfer(self, client_ip: str, serve: Callable[['ClientHandler'], Response]) -> str:
+        """
+        Registers a transfer the data connections of the client
+        can be attached to, by means of the returned token
+        """
+        token = secrets.token_hex(16)
+        with self._transfers_lock:
+            self._transfers[token] = (client_ip, serve)
+        return token
+
+    def remove_transfer(self, token: str):
+        """ Unregisters the transfer identified by token """
+        with self._transfers_lock:
+            self._transfers.pop(token, None)
+
+    def transfer(self, token: str, client_ip: str) -> Optional[Callable[['ClientHandler'], Response]]:
+        """ Returns the transfer identified by token, if it belongs to client_ip """
+        with self._transfers_lock:
+            transfer = self._transfers.get(token)
+
+        if not transfer or transfer[0] != client_ip:
+            return None
+
+        return transfer[1]
+
 
     def server_info(self) -> ServerInfo:
         """ Returns a 'ServerInfo' of this server service"""
@@ -203,6 +233,7 @@ class ClientHandler:
             Requests.RCP: self._rcp,
             Requests.GET: self._get,
             Requests.PUT: self._put,
+            Requests.ATTACH: self._attach,
         }
 
 
@@ -371,6 +402,25 @@ class ClientHandler:
 
         return create_success_response("pong")
 
+    def _attach(self, params: RequestParams):
+        log.i(f"<< ATTACH  |  {self._client}")
+
+        token = params.get(RequestsParams.ATTACH_TOKEN)
+
+        # The token proves that the client has already been
+        # authenticated on the connection that opened the transfer
+        serve = self._api_daemon.transfer(token, self._client.endpoint[0])
+
+        if not serve:
+            log.e("Invalid transfer token")
+            return self._create_error_response(ServerErrors.NOT_ALLOWED)
+
+        # A data connection doesn't serve anything else
+        # after the transfer it has been attached to
+        self._connected_to_server = False
+
+        return serve(self)
+
     @require_server_connection
     @require_unix
     @require_rexec_enabled
@@ -1053,15 +1103,32 @@ class ClientHandler:
         chunk_size = params.get(RequestsParams.GET_CHUNK_SIZE, BEST_BUFFER_SIZE)
         use_mmap = params.get(RequestsParams.GET_MMAP, True)
 
-        log.i(f"<< GET {paths}  |  {self._client}")
+        # Pipelining: number of files the client allows us to announce ahead.
+        # (0 means the classic seek/transfer/skip dialog)
+        window = min(params.get(RequestsParams.GET_WINDOW, 0), MAX_TRANSFER_WINDOW)
+
+        # Parallelism: number of data connections the client will attach
+        # to this transfer (only while pipelining)
+        parallel = min(params.get(RequestsParams.GET_PARALLEL, 0), MAX_TRANSFER_PARALLEL) if window else 0
 
-        self._send_response(create_success_response())
+        # Files bigger than this are served in ranges of this size,
+        # so that they are spread over the data connections too
+        split = params.get(RequestsParams.GET_SPLIT, 0) if parallel else 0
+
+        log.i(f"<< GET {paths}  |  {self._client}")
 
         transfer_socket = self._client.socket
 
         # Next file/directory to serve
         next_servings: Deque[Tuple[FPath, FPath, str]] = deque([]) # fpath, basedir, prefix
 
+        # Ranges of the split file still to announce
+        next_ranges: Deque[Tuple[FPath, str, FileInfo, Tuple[int, int]]] = deque([]) # fpath, spath, finfo, range
+
+        # Guards next_servings and errors while serving
+        # over more data connections
+        transfer_lock = threading.Lock()
+
         errors = []
         aborted = False
 
@@ -1121,64 +1188,19 @@ class ClientHandler:
 
         # --------------
 
-        # 2. Cyclically wait for "next" requests and send the respective file
-
-        def get_next() -> Union[Tuple[FPath, BinaryIO], None]: # fpath, fd
-            next_transfer = None
-
-            while not next_transfer:
-                # len(next_servings) is checked within the loop
-                # after the request
-
-                log.d("Waiting for next() request from client...")
-
-                # 1. Receive the request from the client
-
-                # e.g. {skip: False, transfer: True} // client doesn't provide the path
-                req = self._recv_json(timeout=DEFAULT_TRANSFER_SOCKET_TIMEOUT)
-
-                if not req:
-                    self._send_response(self._create_error_response(ServerErrors.INVALID_REQUEST))
-                    continue
-
-                if len(next_servings) == 0:
-                    log.i("No more files: transfer completed. Sending END")
-                    self._send_response(create_success_response())
-                    break
-
-                next_transfer = handle_get_next_request(req)
-
-                if next_transfer is False:
-                    break
-
-            # Either next_transfer is valid or we have finished
-            return next_transfer
-
-        def handle_get_next_request(req: Dict) -> Union[Tuple[FPath, BinaryIO], None, bool]: # fpath, fd
-            nonlocal aborted
-
-            while True:
-                action = req.get(RequestsParams.GET_NEXT_ACTION)
-                if action not in RequestsParams.GET_NEXT_ACTIONS:
-                    log.w(f"Unknown action: {action}")
-                    action = RequestsParams.GET_NEXT_ACTION_SEEK
-
-                log.i(f"<< GET_NEXT action = {action}")
-
-                if action == RequestsParams.GET_NEXT_ACTION_ABORT:
-                    log.w("Client has request an abort")
-                    aborted = True
-                    return False
-
-                # 2. Serve the file
-                # -> send response to the client anyway
-                # -> return only if there is a file to transfer
+        # 2. Resolve the next serving: expand the directories until
+        # either a file or an empty directory is found
 
+        def resolve_next_serving() -> Optional[Tuple[FPath, str, FileInfo]]: # fpath, spath, finfo
+            """
+            Returns the next file or empty directory to serve.
+            Regular files are NOT popped out of next_servings
+            (either transfer or skip must be specified before), while
+            empty directories are popped out immediately.
+            Returns None if there is nothing more to serve.
+            """
+            while next_servings:
                 # Get next file (or dir)
-                # Do not pop it now: either transfer os skip must be specified
-                # for a regular file before being popped out
-                # (In this way we can handle cases in which the client don't
-                # want to receive the file (because of overwrite, or anything else)
                 next_fpath, next_basedir, next_prefix = next_servings[len(next_servings) - 1]
 
                 log.d(f"Next file fpath: {next_fpath}")
@@ -1193,7 +1215,7 @@ class ClientHandler:
                     # can't even provide a name for the error since
                     # we only have fpath at this point
                     errors.append(create_error_of_response(ServerErrors.INVALID_PATH,
-                                                           q(f)))
+                                                           q(next_fpath.name)))
                     continue
 
                 log.d("Sharing domain check OK")
@@ -1218,74 +1240,11 @@ class ClientHandler:
 
                 # Case: FILE
                 if finfo and next_fpath.is_file():
-                    next_transfer = None
-
                     log.i(f"NEXT FILE: {next_fpath}")
-
-                    # Pop only if transfer or skip is specified
-                    if action == RequestsParams.GET_NEXT_ACTION_TRANSFER or \
-                            action == RequestsParams.GET_NEXT_ACTION_SKIP:
-                        log.d("Popping file out (transfer OR skip specified for FTYPE_FILE)")
-                        next_servings.pop()
-                        if action == RequestsParams.GET_NEXT_ACTION_TRANSFER:
-                            # Actually put the file on the queue of the files
-                            # to be send through the transfer socket
-
-                            # Before doing so, try to open the file for real.
-                            # At least we are able to detect any error (e.g. perm denied)
-                            # before say the client that the transfer is began
-                            # We have to report the error now (create_error_response)
-                            # not later (_add_error()) because the user have to
-                            # take a decision based on this (skip the file)
-                            log.d("Trying to open file before initializing transfer")
-
-                            try:
-                                fd = next_fpath.open("rb")
-                                log.d(f"Able to open file: {next_fpath}")
-
-                                log.d("Actually adding file to the transfer queue")
-                                next_transfer = (next_fpath, fd)
-                            except FileNotFoundError:
-                                log.w("Can't open file - not transferring file (file not found error)")
-                                self._send_response(
-                                    create_error_response(ServerErrors.NOT_EXISTS,
-                                                          q(next_spath_str))
-                                )
-                                return None
-                            except PermissionError:
-                                log.w("Can't open file - not transferring file (permission error)")
-                                self._send_response(
-                                    create_error_response(ServerErrors.PERMISSION_DENIED,
-                                                          q(next_spath_str))
-                                )
-                                return None
-                            except OSError as oserr:
-                                log.w("Can't open file - not transferring file (oserror)")
-                                self._send_response(
-                                    create_error_response(ServerErrors.GENERAL_ERROR,
-                                                          os_error_str(oserr),
-                                                          q(next_spath_str))
-                                )
-                                return None
-                            except Exception as exc:
-                                log.w("Can't open file - not transferring file")
-                                self._send_response(
-                                    create_error_response(ServerErrors.GENERAL_ERROR,
-                                                          exc,
-                                                          q(next_spath_str))
-                                )
-                                return None
-
-                    self._send_response(
-                        create_success_response({
-                            ResponsesParams.GET_NEXT_FILE: finfo
-                        })
-                    )
-
-                    return next_transfer # might be null if action is not "transfer"
+                    return next_fpath, next_spath_str, finfo
 
                 # Case: DIR
-                elif finfo and next_fpath.is_dir():
+                if finfo and next_fpath.is_dir():
                     log.i(f"NEXT DIR: {next_fpath}")
 
                     # Pop it now; it doesn't make sense ask the user whether
@@ -1318,56 +1277,90 @@ class ClientHandler:
                         log.i("Found a filled directory: adding all inner files to remaining_files")
                         for file_in_dir in dir_files:
                             log.i(f"Adding {file_in_dir}")
-                            next_servings.appendleft((file_in_dir, next_basedir, prefix))
-                    else:
-                        log.i("Found an empty directory")
-                        log.d("Sending an info for the empty directory")
-
-                        self._send_response(
-                            create_success_response({
-                                ResponsesParams.GET_NEXT_FILE: finfo
-                            })
-                        )
-                        return None
-                # Case: UNKNOWN (non-existing/link/special files/...)
-                else:
-                    # Pop it now
-                    next_servings.pop()
-                    log.w(f"Not file nor dir? skipping {next_fpath}")
-                    errors.append(create_error_of_response(ServerErrors.GET_TRANSFER_SKIPPED,
-                                                           q(next_spath_str)))
-                    continue
+                            next_servings.appendleft((file_in_dir, next_basedir, next_prefix))
+                        continue
 
+                    log.i("Found an empty directory")
+                    return next_fpath, next_spath_str, finfo
 
-        while True:
-            log.d("Blocking and waiting for a file to handle...")
+                # Case: UNKNOWN (non-existing/link/special files/...)
+                # Pop it now
+                next_servings.pop()
+                log.w(f"Not file nor dir? skipping {next_fpath}")
+                errors.append(create_error_of_response(ServerErrors.GET_TRANSFER_SKIPPED,
+                                                       q(next_spath_str)))
 
-            next_transf = get_next()
+            return None
 
-            if not next_transf:
-                log.i("No more files: transfer completed")
-                break
+        def open_serving(fpath: FPath, spath_str: str) -> Tuple[Optional[BinaryIO], Optional[Response]]:
+            """
+            Tries to open the file for real before say the client that
+            the transfer is began, so that we are able to detect any
+            error (e.g. perm denied) and report it immediately.
+            Returns either the opened file or the error response.
+            """
+            log.d("Trying to open file before initializing transfer")
 
-            next_transf_fpath: FPath
-            next_transf_f: BinaryIO
+            try:
+                fd = fpath.open("rb")
+                log.d(f"Able to open file: {fpath}")
+                return fd, None
+            except FileNotFoundError:
+                log.w("Can't open file - not transferring file (file not found error)")
+                return None, create_error_response(ServerErrors.NOT_EXISTS,
+                                                   q(spath_str))
+            except PermissionError:
+                log.w("Can't open file - not transferring file (permission error)")
+                return None, create_error_response(ServerErrors.PERMISSION_DENIED,
+                                                   q(spath_str))
+            except OSError as oserr:
+                log.w("Can't open file - not transferring file (oserror)")
+                return None, create_error_response(ServerErrors.GENERAL_ERROR,
+                                                   os_error_str(oserr),
+                                                   q(spath_str))
+            except Exception as exc:
+                log.w("Can't open file - not transferring file")
+                return None, create_error_response(ServerErrors.GENERAL_ERROR,
+                                                   exc,
+                                                   q(spath_str))
+
+        def send_serving(fpath: FPath, f: BinaryIO, transfer_socket_: SocketTcp,
+                         frange: Optional[Tuple[int, int]] = None):
+            """
+            Sends the file (or only the range [offset, offset + length)
+            of it, if frange is given) on transfer_socket_.
+            """
+            log.i(f"Next outgoing file to handle: {fpath}")
 
-            next_transf_fpath, next_transf_f = next_transf
+            if frange:
+                offset, length = frange
+            else:
+                offset, length = 0, fpath.stat().st_size
 
-            log.i(f"Next outgoing file to handle: {next_transf_fpath}")
+            file_len = offset + length
 
             # OK - report it
-            print(f"[{self._client.tag}] get '{next_transf_fpath}' "
+            print(f"[{self._client.tag}] get '{fpath}' "
+                  f"{f'[{offset}-{file_len}] ' if frange else ''}"
                   f"({self._client.endpoint[0]}:{self._client.endpoint[1]})")
 
-            file_len = next_transf_fpath.stat().st_size
+            # Zero-copy path: let the kernel move the file to the socket.
+            # Can't be done with SSL (encryption happens in user space) or
+            # if we have to compute the CRC (we would need the data anyway)
+            if not check and not transfer_socket_.is_ssl_enabled():
+                log.d(f"Sending {fpath} with sendfile()")
+                sent = transfer_socket_.sendfile(f, offset, length)
+                log.i(f"Closing file {fpath} ({sent}/{length} sent)")
+                f.close()
+                return
 
             # File is already opened
-            source = next_transf_f
+            source = f
 
             if use_mmap:
                 try:
                     # try to mmap the file to memory
-                    source = mmap.mmap(next_transf_f.fileno(), 0,
+                    source = mmap.mmap(f.fileno(), 0,
                                        prot=mmap.PROT_READ)
                 except Exception as ex:
                     log.w(f"mmap failed, will read directly from file for reason: {ex}")
@@ -1377,11 +1370,14 @@ class ClientHandler:
             #  since we can't tell the user about it.
             #  BTW open is already done so there should be no permissions problems.
 
-            cur_pos = 0
+            cur_pos = offset
             crc = 0
 
-            # Send file
+            if offset:
+                # Each range has its own file (or mmap), seek is enough
+                source.seek(offset)
 
+            # Send file
 
             while cur_pos < file_len:
                 readlen = min(file_len - cur_pos, chunk_size)
@@ -1391,7 +1387,7 @@ class ClientHandler:
 
                 if not chunk:
                     # EOF
-                    log.i(f"Finished to handle: {next_transf_fpath}")
+                    log.i(f"Finished to handle: {fpath}")
                     break
 
                 log.h(f"Read chunk of {len(chunk)}B")
@@ -1402,20 +1398,246 @@ class ClientHandler:
                     # Eventually update the CRC
                     crc = zlib.crc32(chunk, crc)
 
-                log.h(f"{cur_pos}/{file_len} ({cur_pos / file_len * 100:.2f})")
+                log.h(f"{cur_pos}/{file_len} ({(cur_pos - offset) / length * 100:.2f})")
 
-                transfer_socket.send(chunk)
+                transfer_socket_.send(chunk)
 
 
-            log.i(f"Closing file {next_transf_fpath}")
-            next_transf_f.close()
-            if source != next_transf_f:
+            log.i(f"Closing file {fpath}")
+            f.close()
+            if source != f:
                 source.close() # mmap
 
             # Eventually send the CRC in-band
             if check:
                 log.d(f"Sending CRC: {crc}")
-                transfer_socket.send(itob(crc, 4))
+                transfer_socket_.send(itob(crc, 4))
+
+        # 3a. Pipelined mode: announce up to 'window' files ahead, without
+        # waiting for the client to ask for them; the client answers to
+        # each announcement with either transfer or skip, and we push
+        # the data of the accepted files back-to-back.
+        # Since both the sides keep exactly 'window' pending announcements,
+        # the stream is deterministic and no round trip is spent per file.
+
+        def serve_pipelined(handler: 'ClientHandler'):
+            nonlocal aborted
+
+            announced: Deque[Tuple[FPath, str, FileInfo, Optional[Tuple[int, int]]]] = deque([])
+            ended = False
+
+            def announce_next():
+                nonlocal ended
+
+                with transfer_lock:
+                    next_serving = None
+
+                    if aborted:
+                        # Once aborted, the other data connections end too
+                        log.d("Transfer aborted, nothing more to announce")
+                    elif next_ranges:
+                        # Another range of a split file
+                        next_serving = next_ranges.popleft()
+                    else:
+                        next_serving = resolve_next_serving()
+
+                        if next_serving:
+                            next_fpath, next_spath_str, next_finfo = next_serving
+                            next_serving = (next_fpath, next_spath_str, next_finfo, None)
+
+                            if next_finfo.get("ftype") == FTYPE_FILE:
+                                # Pop it now: the decision will arrive
+                                # in the same order of the announcements
+                                next_servings.pop()
+
+                                fsize = next_finfo.get("size")
+
+                                if split and fsize > split:
+                                    log.d(f"Splitting {next_fpath} in ranges of {split}B")
+                                    next_ranges.extend(
+                                        (next_fpath, next_spath_str, next_finfo,
+                                         (offset, min(split, fsize - offset)))
+                                        for offset in range(0, fsize, split)
+                                    )
+                                    next_serving = next_ranges.popleft()
+
+                if not next_serving:
+                    log.i("No more files to announce: sending END")
+                    handler._send_response(create_success_response())
+                    ended = True
+                    return
+
+                next_fpath, next_spath_str, next_finfo, next_frange = next_serving
+
+                announced.append(next_serving)
+
+                announcement = {
+                    ResponsesParams.GET_NEXT_FILE: next_finfo
+                }
+
+                if next_frange:
+                    announcement[ResponsesParams.GET_NEXT_RANGE] = next_frange
+
+                handler._send_response(create_success_response(announcement))
+
+            while not ended and len(announced) < window:
+                announce_next()
+
+            while announced:
+                log.d("Waiting for the decision about the oldest announcement...")
+
+                req = handler._recv_json(timeout=DEFAULT_TRANSFER_SOCKET_TIMEOUT)
+
+                fpath, spath_str, finfo, frange = announced.popleft()
+
+                action = req.get(RequestsParams.GET_NEXT_ACTION) if req else None
+
+                log.i(f"<< GET_NEXT action = {action} ({spath_str})")
+
+                if action == RequestsParams.GET_NEXT_ACTION_ABORT:
+                    log.w("Client has request an abort")
+                    aborted = True
+                    break
+
+                if action == RequestsParams.GET_NEXT_ACTION_TRANSFER and \
+                        finfo.get("ftype") == FTYPE_FILE:
+                    fd, error_resp = open_serving(fpath, spath_str)
+                    if error_resp:
+                        handler._send_response(error_resp)
+                    else:
+                        handler._send_response(create_success_response())
+                        send_serving(fpath, fd, handler._client.socket, frange)
+
+                if not ended:
+                    announce_next()
+
+        def serve_attached(handler: 'ClientHandler') -> Response:
+            """
+            Serves the transfer over a data connection attached to it,
+            in the same way serve_pipelined() does over this connection.
+            Returns the outcome for the data connection.
+            """
+            handler._send_response(create_success_response({
+                ResponsesParams.GET_WINDOW: window
+            }))
+
+            serve_pipelined(handler)
+
+            return create_success_response({
+                ResponsesParams.GET_OUTCOME: not aborted
+            })
+
+        # 3b. Cyclically wait for "next" requests and send the respective file
+
+        def get_next() -> Union[Tuple[FPath, BinaryIO], None]: # fpath, fd
+            nonlocal aborted
+
+            next_transfer = None
+
+            while not next_transfer:
+                log.d("Waiting for next() request from client...")
+
+                # 1. Receive the request from the client
+
+                # e.g. {skip: False, transfer: True} // client doesn't provide the path
+                req = self._recv_json(timeout=DEFAULT_TRANSFER_SOCKET_TIMEOUT)
+
+                if not req:
+                    self._send_response(self._create_error_response(ServerErrors.INVALID_REQUEST))
+                    continue
+
+                action = req.get(RequestsParams.GET_NEXT_ACTION)
+                if action not in RequestsParams.GET_NEXT_ACTIONS:
+                    log.w(f"Unknown action: {action}")
+                    action = RequestsParams.GET_NEXT_ACTION_SEEK
+
+                log.i(f"<< GET_NEXT action = {action}")
+
+                if action == RequestsParams.GET_NEXT_ACTION_ABORT:
+                    log.w("Client has request an abort")
+                    aborted = True
+                    break
+
+                # 2. Serve the file
+                # -> send response to the client anyway
+                # -> return only if there is a file to transfer
+
+                next_serving = resolve_next_serving()
+
+                if not next_serving:
+                    log.i("No more files: transfer completed. Sending END")
+                    self._send_response(create_success_response())
+                    break
+
+                next_fpath, next_spath_str, finfo = next_serving
+
+                # Pop only if transfer or skip is specified
+                # (In this way we can handle cases in which the client don't
+                # want to receive the file (because of overwrite, or anything else)
+                if finfo.get("ftype") == FTYPE_FILE and \
+                        (action == RequestsParams.GET_NEXT_ACTION_TRANSFER or
+                         action == RequestsParams.GET_NEXT_ACTION_SKIP):
+                    log.d("Popping file out (transfer OR skip specified for FTYPE_FILE)")
+                    next_servings.pop()
+
+                    if action == RequestsParams.GET_NEXT_ACTION_TRANSFER:
+                        # We have to report the error now (create_error_response)
+                        # not later (_add_error()) because the user have to
+                        # take a decision based on this (skip the file)
+                        fd, error_resp = open_serving(next_fpath, next_spath_str)
+                        if error_resp:
+                            self._send_response(error_resp)
+                            continue
+
+                        log.d("Actually adding file to the transfer queue")
+                        next_transfer = (next_fpath, fd)
+
+                self._send_response(
+                    create_success_response({
+                        ResponsesParams.GET_NEXT_FILE: finfo
+                    })
+                )
+
+            # Either next_transfer is valid or we have finished
+            return next_transfer
+
+        token = None
+
+        if window and parallel:
+            # The files are served over the data connections the client
+            # attaches to this transfer, while this one stays idle
+            token = self._api_daemon.add_transfer(self._client.endpoint[0], serve_attached)
+            self._send_response(create_success_response({
+                ResponsesParams.GET_WINDOW: window,
+                ResponsesParams.GET_PARALLEL: parallel,
+                ResponsesParams.GET_TOKEN: token
+            }))
+        elif window:
+            self._send_response(create_success_response({
+                ResponsesParams.GET_WINDOW: window
+            }))
+        else:
+            self._send_response(create_success_response())
+
+        if token:
+            try:
+                log.d("Waiting for the end of the data connections...")
+                self._recv_json()
+            finally:
+                self._api_daemon.remove_transfer(token)
+        elif window:
+            serve_pipelined(self)
+        else:
+            while True:
+                log.d("Blocking and waiting for a file to handle...")
+
+                next_transf = get_next()
+
+                if not next_transf:
+                    log.i("No more files: transfer completed")
+                    break
+
+                send_serving(*next_transf, transfer_socket)
 
         log.i("GET finished")
 
@@ -1439,20 +1661,40 @@ class ClientHandler:
         dest = params.get(RequestsParams.PUT_DEST)
         is_multiple = params.get(RequestsParams.PUT_IS_MULTIPLE)
 
-        # Hidden
+        # Pipelining: number of file infos the client sends ahead
+        # (0 means the classic one-by-one put_next() dialog)
+        window = min(params.get(RequestsParams.PUT_WINDOW, 0), MAX_TRANSFER_WINDOW)
 
-        log.i(f"<< PUT {'(preview)' if preview else ''}  |  {self._client}")
+        # Parallelism: number of data connections the client will attach
+        # to this transfer (only while pipelining)
+        parallel = min(params.get(RequestsParams.PUT_PARALLEL, 0), MAX_TRANSFER_PARALLEL) if window else 0
+
+        # Files bigger than this can be sent in ranges of this size,
+        # which are written in place with pwrite() (if available)
+        split = params.get(RequestsParams.PUT_SPLIT, 0) \
+            if parallel and not preview and hasattr(os, "pwrite") else 0
 
-        self._send_response(create_success_response())
+        log.i(f"<< PUT {'(preview)' if preview else ''}  |  {self._client}")
 
         transfer_socket = self._client.socket
 
+        # Preallocated once: the data is received directly into it
+        # and written to disk from it
+        recv_buffer = memoryview(bytearray(BEST_BUFFER_SIZE))
+
+        # Guards the decisions about the incoming files (and the sync table)
+        # while receiving over more data connections
+        transfer_lock = threading.Lock()
+
         errors = []
         outcome = True
 
         sync_table: Optional[Dict[str, None]] = None
         sync_table_entries = []
 
+        # State of the split files whose ranges are being received
+        split_incomings: Dict[FPath, Dict] = {}
+
         def compute_dest_path(finfo_: FileInfo):
             """
             --dest handling
@@ -1546,244 +1788,288 @@ class ClientHandler:
             log.d(f"SYNC table computed ({len(sync_table_entries)})\n" +
                   "\n".join(sync_table.keys()))
 
-        def put_next():
-            nonlocal outcome
+        def open_incoming(fpath: FPath, fname: str, mode: str) -> Tuple[Optional[BinaryIO], Optional[Response]]:
+            """
+            Before accept it for real, try to open the file.
+            At least we are able to detect any error (e.g. perm denied)
+            before say the the that the transfer is began.
+            Returns either the opened file or the error response.
+            """
+            log.d(f"Trying to open {fpath} before initializing transfer")
 
-            while True:
-                log.d("Waiting for next() request from client...")
+            try:
+                fd = fpath.open(mode)
+                log.d(f"Able to open file: {fpath}")
+                return fd, None
+            except FileNotFoundError:
+                return None, self._create_error_response(ServerErrors.NOT_EXISTS, q(fname))
+            except PermissionError:
+                return None, self._create_error_response(ServerErrors.PERMISSION_DENIED, q(fname))
+            except OSError as oserr:
+                return None, self._create_error_response(ServerErrors.GENERAL_ERROR,
+                                                         os_error_str(oserr), q(fname))
+            except Exception as exc:
+                return None, self._create_error_response(ServerErrors.GENERAL_ERROR, exc, q(fname))
+
+        def overwrite_status(fpath: FPath, fsize: int, fmtime: int, overwrite: str) -> str:
+            """
+            Takes a decision about the already existing file fpath
+            based on the overwrite policy.
+            Returns either the status accepted, refused or uncertain
+            (the client has to ask the user).
+            """
+            if overwrite == RequestsParams.PUT_NEXT_OVERWRITE_PROMPT:
+                log.d("Overwrite policy is PROMPT, asking the client whether overwrite")
+                return ResponsesParams.PUT_NEXT_STATUS_UNCERTAIN
 
-                # 1. Receive the request from the client
+            if overwrite in RequestsParams.PUT_NEXT_OVERWRITES_NEWER or \
+                overwrite in RequestsParams.PUT_NEXT_OVERWRITES_DIFF_SIZE:
+                stat = fpath.stat()
 
-                # e.g. {file: {name: f1, size: 293}, overwrite: "..."} // client doesn't provide the path
+                will_accept = False
 
-                req = self._recv_json(timeout=DEFAULT_TRANSFER_SOCKET_TIMEOUT)
+                if overwrite in RequestsParams.PUT_NEXT_OVERWRITES_NEWER:
+                    log.d("Overwrite policy is NEWER, checking mtime")
+                    will_accept = will_accept or is_newer(fmtime, stat.st_mtime_ns)
 
-                # File info
-                finfo = req.get(RequestsParams.PUT_NEXT_FILE)
-                do_sync = req.get(RequestsParams.PUT_NEXT_SYNC)
+                if overwrite in RequestsParams.PUT_NEXT_OVERWRITES_DIFF_SIZE:
+                    log.d("Overwrite policy is SIZE, checking size")
+                    will_accept = will_accept or stat.st_size != fsize
 
-                if not finfo:
-                    log.i("<< PUT_NEXT DONE")
-                    self._send_response(create_success_response())
-                    break
+                if not will_accept:
+                    return ResponsesParams.PUT_NEXT_STATUS_REFUSED
 
-                fname = finfo.get("name")
-                ftype = finfo.get("ftype")
-                fsize = finfo.get("size")
-                fmtime = finfo.get("mtime")
+                log.d("Will accept file")
 
-                if fname is None or ftype is None or fsize is None or fmtime is None:
-                    self._send_response(self._create_error_response(
-                        ServerErrors.INVALID_REQUEST)
-                    )
-                    continue
+            elif overwrite == RequestsParams.PUT_NEXT_OVERWRITE_YES:
+                log.d("Overwrite policy is YES, overwriting it unconditionally")
 
-                # Overwrite
-                overwrite = req.get(RequestsParams.PUT_NEXT_OVERWRITE)
-                if overwrite not in RequestsParams.PUT_NEXT_OVERWRITES:
-                    log.w("Unspecified overwrite, using PROMPT")
-                    overwrite = RequestsParams.PUT_NEXT_OVERWRITE_PROMPT
+            elif overwrite == RequestsParams.PUT_NEXT_OVERWRITE_NO:
+                log.d("Overwrite policy is NO, skipping it")
+                return ResponsesParams.PUT_NEXT_STATUS_REFUSED
 
-                log.i(f"<< PUT_NEXT {j(finfo)}")
+            return ResponsesParams.PUT_NEXT_STATUS_ACCEPTED
 
-                # Compute local path, taking dest into account
-                try:
-                    fpath = compute_dest_path(finfo)
-                except Exception as exc:
-                    outcome = False
-                    log.e(f"Invalid dest semantic {exc}")
-                    err_resp = self._create_error_response(
-                        ServerErrors.PUT_INVALID_DEST_SEMANTIC, q(fname))
-                    err_resp[ResponsesParams.PUT_ABORT] = True
-
-                    self._send_response(err_resp)
-                    # the abort flag is only a suggestion, we will continue
-                    # the put_next loop (the expected behaviour is that the client
-                    # will send us an empty file (i.e. a DONE) the next iteration
-                    continue
+        def handle_put_range_request(fpath: FPath, fname: str, fsize: int, fmtime: int,
+                                     overwrite: str, frange: Tuple[int, int],
+                                     already_exists: bool) -> Tuple[Response, Optional[Tuple]]:
+            """
+            Handles the put_next() request of a range of a split file.
+            The overwrite policy is applied only for the first range of the
+            file: the others get the same status; if it is uncertain the client
+            resolves each range on its own (asking the user only once).
+            The file is opened once and shared among the ranges, which
+            are written in place.
+            """
+            split_incoming = split_incomings.get(fpath)
 
-                log.d(f"fpath = {fpath}")
+            if not split_incoming:
+                status = ResponsesParams.PUT_NEXT_STATUS_ACCEPTED
 
-                if not self._is_fpath_allowed(fpath):
-                    log.e(f"Path '{fpath}' is invalid (out of sharing domain)")
-                    self._send_response(self._create_error_response(
-                        ServerErrors.INVALID_PATH, q(fname))
-                    )
-                    continue
+                if fpath.is_file():
+                    status = overwrite_status(fpath, fsize, fmtime, overwrite)
 
-                log.d("Sharing domain check OK")
+                fd = None
 
-                # If sync is True track the files in the directory
-                # so that we can remove old files (the one for which no file info
-                # is retrieved from the server) after the transfer completes.
-                if do_sync:
-                    if sync_table is None:  # check is None because if the dir is new
-                                            # sync table could be already initialized but empty
-                        add_to_sync_table(fpath)
-
-                    # Remove from the SYNC table eventually
-                    # Do the removal for each possible path within local_path
-                    # (so that we won't delete parent folder if the change is
-                    # inside the children)
-
-                if sync_table_entries:
-                    incremental_path = Path.cwd()
-                    for part in fpath.parts:
-                        incremental_path = incremental_path / part
-                        incremental_path_str = str(incremental_path)
-                        log.d(f"Removing from SYNC table: '{incremental_path_str}'")
-                        try:
-                            sync_table_entries.remove(incremental_path_str)
-                            log.d(f"Actually removed, len is now = {len(sync_table_entries)}")
-                        except:
-                            pass
-
-                already_exists = fpath.exists()
-
-                # Check whether is a dir or a file
-                if ftype == FTYPE_DIR:
-                    # Handle dir now by creating dirs
-                    if not preview:
-                        log.i(f"Creating dirs {fpath}")
-                        fpath.mkdir(parents=True, exist_ok=True)
-                    self._send_response(create_success_response({
-                        ResponsesParams.PUT_NEXT_STATUS:
-                            ResponsesParams.PUT_NEXT_STATUS_ACCEPTED,
-                        ResponsesParams.PUT_NEXT_ALREADY_EXISTS: already_exists
-                    }))
-                    continue
+                if status != ResponsesParams.PUT_NEXT_STATUS_REFUSED:
+                    # Don't truncate an existing file now, it could be refused
+                    fd, error_resp = open_incoming(fpath, fname, "r+b" if fpath.is_file() else "wb")
+                    if error_resp:
+                        return error_resp, None
 
-                if not ftype == FTYPE_FILE:  # wtf
-                    self._send_response(self._create_error_response(
-                        ServerErrors.INVALID_COMMAND_SYNTAX)
-                    )
-                    continue
+                    if status == ResponsesParams.PUT_NEXT_STATUS_ACCEPTED:
+                        fd.truncate(fsize)
 
-                if ftype == FTYPE_FILE:
-                    fpath_parent = fpath.parent
-                    if fpath_parent:
-                        if not preview:
-                            log.i(f"Creating parent dirs {fpath_parent}")
-                            fpath_parent.mkdir(parents=True, exist_ok=True)
+                split_incoming = {
+                    "status": status,
+                    "fd": fd,
+                    "remaining": fsize,
+                    "sized": status == ResponsesParams.PUT_NEXT_STATUS_ACCEPTED
+                }
+                split_incomings[fpath] = split_incoming
 
-                # Check whether it already exists
-                if fpath.is_file():
-                    def skip_transfer():
-                        self._send_response(create_success_response({
-                            ResponsesParams.PUT_NEXT_STATUS:
-                                ResponsesParams.PUT_NEXT_STATUS_REFUSED,
-                            ResponsesParams.PUT_NEXT_ALREADY_EXISTS: already_exists
-                        }))
-
-                    log.w(f"File already exists; deciding what to do based on overwrite policy: {overwrite}")
-
-                    # Take a decision based on the overwrite policy
-                    if overwrite == RequestsParams.PUT_NEXT_OVERWRITE_PROMPT:
-                        log.d("Overwrite policy is PROMPT, asking the client whether overwrite")
-                        self._send_response(create_success_response({
-                            ResponsesParams.PUT_NEXT_STATUS:
-                                ResponsesParams.PUT_NEXT_STATUS_UNCERTAIN,
-                            ResponsesParams.PUT_NEXT_FILE_INFO:
-                                create_file_info(fpath, name=str(self._spath_rel_to_root_of_fpath(fpath))),
-                            ResponsesParams.PUT_NEXT_ALREADY_EXISTS: already_exists
-                        }))
-                        continue
+            status = split_incoming["status"]
 
-                    if overwrite in RequestsParams.PUT_NEXT_OVERWRITES_NEWER or \
-                        overwrite in RequestsParams.PUT_NEXT_OVERWRITES_DIFF_SIZE:
-                        stat = fpath.stat()
+            resp_data = {
+                ResponsesParams.PUT_NEXT_STATUS: status,
+                ResponsesParams.PUT_NEXT_ALREADY_EXISTS: already_exists
+            }
 
-                        will_accept = False
+            if status == ResponsesParams.PUT_NEXT_STATUS_UNCERTAIN:
+                resp_data[ResponsesParams.PUT_NEXT_FILE_INFO] = \
+                    create_file_info(fpath, name=str(self._spath_rel_to_root_of_fpath(fpath)))
 
-                        if overwrite in RequestsParams.PUT_NEXT_OVERWRITES_NEWER:
-                            log.d("Overwrite policy is NEWER, checking mtime")
-                            will_accept = will_accept or is_newer(fmtime, stat.st_mtime_ns)
+            return create_success_response(resp_data), \
+                   (status, fpath, fsize, fmtime, split_incoming["fd"], frange)
 
-                        if overwrite in RequestsParams.PUT_NEXT_OVERWRITES_DIFF_SIZE:
-                            log.d("Overwrite policy is SIZE, checking size")
-                            will_accept = will_accept or stat.st_size != fsize
+        def handle_put_next_request(req: Dict, pipelined: bool = False) -> Tuple[Response, Optional[Tuple]]:
+            """
+            Handles a put_next() request of the client, taking a decision
+            about the file based on the overwrite policy.
+            Returns the response for the client and, if the file has been
+            accepted (or is uncertain, while pipelining), the incoming
+            (status, fpath, fsize, fmtime, fd, range) the data will be written to.
+            Ranges of split files are accepted only if split is enabled.
+            """
+            nonlocal outcome
 
-                        if will_accept:
-                            log.d("Will accept file")
-                        else:
-                            skip_transfer()
-                            continue
+            # File info
+            finfo = req.get(RequestsParams.PUT_NEXT_FILE)
+            do_sync = req.get(RequestsParams.PUT_NEXT_SYNC)
 
-                    elif overwrite == RequestsParams.PUT_NEXT_OVERWRITE_YES:
-                        log.d("Overwrite policy is YES, overwriting it unconditionally")
+            fname = finfo.get("name")
+            ftype = finfo.get("ftype")
+            fsize = finfo.get("size")
+            fmtime = finfo.get("mtime")
 
-                    elif overwrite == RequestsParams.PUT_NEXT_OVERWRITE_NO:
-                        log.d("Overwrite policy is NO, skipping it")
-                        skip_transfer()
-                        continue
+            if fname is None or ftype is None or fsize is None or fmtime is None:
+                return self._create_error_response(ServerErrors.INVALID_REQUEST), None
 
-                # Before accept it for real, try to open the file.
-                # At least we are able to detect any error (e.g. perm denied)
-                # before say the the that the transfer is began.
+            frange = req.get(RequestsParams.PUT_NEXT_RANGE) if split else None
 
-                fd = None
+            # Overwrite
+            overwrite = req.get(RequestsParams.PUT_NEXT_OVERWRITE)
+            if overwrite not in RequestsParams.PUT_NEXT_OVERWRITES:
+                log.w("Unspecified overwrite, using PROMPT")
+                overwrite = RequestsParams.PUT_NEXT_OVERWRITE_PROMPT
 
-                if not preview:
-                    # If it's just a preview don't try to open the file for real
-                    log.d(f"Trying to open {fpath} before initializing transfer")
+            log.i(f"<< PUT_NEXT {j(finfo)}")
 
+            # Compute local path, taking dest into account
+            try:
+                fpath = compute_dest_path(finfo)
+            except Exception as exc:
+                outcome = False
+                log.e(f"Invalid dest semantic {exc}")
+                err_resp = self._create_error_response(
+                    ServerErrors.PUT_INVALID_DEST_SEMANTIC, q(fname))
+                err_resp[ResponsesParams.PUT_ABORT] = True
+
+                # the abort flag is only a suggestion, we will continue
+                # the put_next loop (the expected behaviour is that the client
+                # will send us an empty file (i.e. a DONE) the next iteration
+                return err_resp, None
+
+            log.d(f"fpath = {fpath}")
+
+            if not self._is_fpath_allowed(fpath):
+                log.e(f"Path '{fpath}' is invalid (out of sharing domain)")
+                return self._create_error_response(ServerErrors.INVALID_PATH, q(fname)), None
+
+            log.d("Sharing domain check OK")
+
+            # If sync is True track the files in the directory
+            # so that we can remove old files (the one for which no file info
+            # is retrieved from the server) after the transfer completes.
+            if do_sync:
+                if sync_table is None:  # check is None because if the dir is new
+                                        # sync table could be already initialized but empty
+                    add_to_sync_table(fpath)
+
+                # Remove from the SYNC table eventually
+                # Do the removal for each possible path within local_path
+                # (so that we won't delete parent folder if the change is
+                # inside the children)
+
+            if sync_table_entries:
+                incremental_path = Path.cwd()
+                for part in fpath.parts:
+                    incremental_path = incremental_path / part
+                    incremental_path_str = str(incremental_path)
+                    log.d(f"Removing from SYNC table: '{incremental_path_str}'")
                     try:
-                        fd = fpath.open("wb")
-                        log.d(f"Able to open file: {fpath}")
-                    except Exception as exc:
-                        if isinstance(exc, FileNotFoundError):
-                            self._send_response(self._create_error_response(
-                                ServerErrors.NOT_EXISTS, q(fname))
-                            )
-                            continue
-
-                        if isinstance(exc, PermissionError):
-                            self._send_response(self._create_error_response(
-                                ServerErrors.PERMISSION_DENIED, q(fname))
-                            )
-                            continue
-
-                        if isinstance(exc, OSError):
-                            self._send_response(self._create_error_response(
-                                ServerErrors.GENERAL_ERROR, os_error_str(exc), q(fname))
-                            )
-                            continue
+                        sync_table_entries.remove(incremental_path_str)
+                        log.d(f"Actually removed, len is now = {len(sync_table_entries)}")
+                    except:
+                        pass
 
-                        self._send_response(self._create_error_response(
-                            ServerErrors.GENERAL_ERROR, exc, q(fname))
-                        )
-                        continue
+            already_exists = fpath.exists()
 
-                self._send_response(create_success_response({
+            # Check whether is a dir or a file
+            if ftype == FTYPE_DIR:
+                # Handle dir now by creating dirs
+                if not preview:
+                    log.i(f"Creating dirs {fpath}")
+                    fpath.mkdir(parents=True, exist_ok=True)
+                return create_success_response({
                     ResponsesParams.PUT_NEXT_STATUS:
                         ResponsesParams.PUT_NEXT_STATUS_ACCEPTED,
                     ResponsesParams.PUT_NEXT_ALREADY_EXISTS: already_exists
-                }))
+                }), None
 
-                return fpath, fsize, fmtime, fd
+            if not ftype == FTYPE_FILE:  # wtf
+                return self._create_error_response(ServerErrors.INVALID_COMMAND_SYNTAX), None
 
-        while True:
-            log.d("Blocking and waiting for a file to handle...")
+            fpath_parent = fpath.parent
+            if fpath_parent:
+                if not preview:
+                    log.i(f"Creating parent dirs {fpath_parent}")
+                    fpath_parent.mkdir(parents=True, exist_ok=True)
+
+            if frange:
+                return handle_put_range_request(fpath, fname, fsize, fmtime,
+                                                overwrite, frange, already_exists)
+
+            refused_resp = create_success_response({
+                ResponsesParams.PUT_NEXT_STATUS:
+                    ResponsesParams.PUT_NEXT_STATUS_REFUSED,
+                ResponsesParams.PUT_NEXT_ALREADY_EXISTS: already_exists
+            })
+
+            # Check whether it already exists
+            if fpath.is_file():
+                log.w(f"File already exists; deciding what to do based on overwrite policy: {overwrite}")
+
+                # Take a decision based on the overwrite policy
+                status = overwrite_status(fpath, fsize, fmtime, overwrite)
+
+                if status == ResponsesParams.PUT_NEXT_STATUS_UNCERTAIN:
+                    fd = None
+
+                    if pipelined and not preview:
+                        # The client won't wait for another response after
+                        # having told us its decision, therefore check
+                        # whether we would be able to write the file now
+                        # (without truncating it)
+                        fd, error_resp = open_incoming(fpath, fname, "r+b")
+                        if error_resp:
+                            return error_resp, None
+
+                    return create_success_response({
+                        ResponsesParams.PUT_NEXT_STATUS:
+                            ResponsesParams.PUT_NEXT_STATUS_UNCERTAIN,
+                        ResponsesParams.PUT_NEXT_FILE_INFO:
+                            create_file_info(fpath, name=str(self._spath_rel_to_root_of_fpath(fpath))),
+                        ResponsesParams.PUT_NEXT_ALREADY_EXISTS: already_exists
+                    }), (ResponsesParams.PUT_NEXT_STATUS_UNCERTAIN, fpath, fsize, fmtime, fd, None)
 
-            # Recv files until the incomings buffer is empty
-            # Wait on the blocking queue for the next file to recv
-            next_incoming = put_next()
+                if status == ResponsesParams.PUT_NEXT_STATUS_REFUSED:
+                    return refused_resp, None
 
-            if next_incoming is None:
-                log.i("No more files: transfer completed")
-                break
+            fd = None
 
-            incoming_fpath, incoming_size, incoming_mtime, local_fd = next_incoming
+            if not preview:
+                # If it's just a preview don't try to open the file for real
+                fd, error_resp = open_incoming(fpath, fname, "wb")
+                if error_resp:
+                    return error_resp, None
 
-            if preview:
-                log.i("Just a preview, not transferring file for real")
-                # Don't transfer, just a preview
-                continue
+            return create_success_response({
+                ResponsesParams.PUT_NEXT_STATUS:
+                    ResponsesParams.PUT_NEXT_STATUS_ACCEPTED,
+                ResponsesParams.PUT_NEXT_ALREADY_EXISTS: already_exists
+            }), (ResponsesParams.PUT_NEXT_STATUS_ACCEPTED, fpath, fsize, fmtime, fd, None)
 
-            log.i(f"Next incoming file to handle: {incoming_fpath}")
+        def receive_incoming(fpath: FPath, fsize: int, fmtime: int, fd: BinaryIO,
+                             transfer_socket_: SocketTcp, recv_buffer_: memoryview) -> bool:
+            """
+            Receives the file the client is sending us and writes it to fd.
+            Returns False if the check of the file fails.
+            """
+            log.i(f"Next incoming file to handle: {fpath}")
 
             # OK - report it
-            print(f"[{self._client.tag}] put '{incoming_fpath}' "
+            print(f"[{self._client.tag}] put '{fpath}' "
                   f"({self._client.endpoint[0]}:{self._client.endpoint[1]})")
 
 
@@ -1798,61 +2084,291 @@ class ClientHandler:
             crc = 0
 
             # Recv file
-            while cur_pos < incoming_size:
-                readlen = min(incoming_size - cur_pos, BEST_BUFFER_SIZE)
+            while cur_pos < fsize:
+                readlen = min(fsize - cur_pos, len(recv_buffer_))
 
-                # Read from the remote
+                # Read from the remote, directly into the buffer
                 log.h(f"Waiting a chunk of {readlen}B")
-                chunk = transfer_socket.recv(readlen)
+                chunk = recv_buffer_[:readlen]
 
-                if not chunk:
+                if transfer_socket_.readinto(chunk, trace=False) < readlen:
                     # EOF
-                    log.i(f"Finished to handle: {incoming_fpath}")
+                    log.i(f"Connection closed while handling: {fpath}")
                     break
 
-                log.h(f"Received chunk of {len(chunk)}B")
-                cur_pos += len(chunk)
+                log.h(f"Received chunk of {readlen}B")
+                cur_pos += readlen
 
                 if check:
                     # Eventually update the CRC
                     crc = zlib.crc32(chunk, crc)
 
-                local_fd.write(chunk)
-
-                log.h(f"{cur_pos}/{incoming_size}")
+                fd.write(chunk)
 
-                # time.sleep(0.5)
+                log.h(f"{cur_pos}/{fsize}")
 
-            log.i(f"Closing file {incoming_fpath}")
-            local_fd.close()
+            log.i(f"Closing file {fpath}")
+            fd.close()
 
             # Adjust the mtime based on the remote
-            log.d(f"Setting mtime = {incoming_mtime}")
-            set_mtime(incoming_fpath, incoming_mtime, round_up=True)
+            log.d(f"Setting mtime = {fmtime}")
+            set_mtime(fpath, fmtime, round_up=True)
 
             # Eventually do CRC check
             if check:
                 # CRC check on the received bytes
-                expected_crc = btoi(transfer_socket.recv(4))
+                expected_crc = btoi(transfer_socket_.recv(4))
                 if expected_crc != crc:
                     log.e(f"Wrong CRC; transfer failed. expected={expected_crc} | written={crc}")
                     errors.append(create_error_of_response(ServerErrors.PUT_CHECK_FAILED,
-                                                           *self._qspathify(incoming_fpath)))
-                    break
+                                                           *self._qspathify(fpath)))
+                    return False
                 else:
                     log.d("CRC check: OK")
 
                 # Length check on the written file
-                written_size = incoming_fpath.stat().st_size
-                if written_size != incoming_size:
-                    log.e(f"File length mismatch; transfer failed. expected={incoming_size} ; written={written_size}")
+                written_size = fpath.stat().st_size
+                if written_size != fsize:
+                    log.e(f"File length mismatch; transfer failed. expected={fsize} ; written={written_size}")
                     errors.append(create_error_of_response(ServerErrors.PUT_CHECK_FAILED,
-                                                           *self._qspathify(incoming_fpath)))
-
-                    break
+                                                           *self._qspathify(fpath)))
+                    return False
                 else:
                     log.d("File length check: OK")
 
+            return True
+
+        def receive_range(fpath: FPath, fmtime: int, fd: Optional[BinaryIO], frange: Tuple[int, int],
+                          transfer_socket_: SocketTcp, recv_buffer_: memoryview) -> bool:
+            """
+            Receives a range of a split file and writes it in place with pwrite()
+            (fd is None if the range won't be sent, e.g. refused).
+            The file is closed after its last range.
+            Returns False if the check of the range fails.
+            """
+            offset, length = frange
+            checked = True
+
+            if fd:
+                log.i(f"Next incoming range to handle: {fpath} [{offset}-{offset + length}]")
+
+                # OK - report it
+                print(f"[{self._client.tag}] put '{fpath}' [{offset}-{offset + length}] "
+                      f"({self._client.endpoint[0]}:{self._client.endpoint[1]})")
+
+                cur_pos = 0
+                crc = 0
+
+                # Recv range
+                while cur_pos < length:
+                    readlen = min(length - cur_pos, len(recv_buffer_))
+
+                    # Read from the remote, directly into the buffer
+                    chunk = recv_buffer_[:readlen]
+
+                    if transfer_socket_.readinto(chunk, trace=False) < readlen:
+                        # EOF
+                        log.i(f"Connection closed while handling: {fpath}")
+                        break
+
+                    if check:
+                        # Eventually update the CRC
+                        crc = zlib.crc32(chunk, crc)
+
+                    os.pwrite(fd.fileno(), chunk, offset + cur_pos)
+                    cur_pos += readlen
+
+                    log.h(f"{cur_pos}/{length}")
+
+                # Eventually do CRC check
+                if check:
+                    # CRC check on the received bytes
+                    expected_crc = btoi(transfer_socket_.recv(4))
+                    if expected_crc != crc:
+                        log.e(f"Wrong CRC; transfer failed. expected={expected_crc} | written={crc}")
+                        errors.append(create_error_of_response(ServerErrors.PUT_CHECK_FAILED,
+                                                               *self._qspathify(fpath)))
+                        checked = False
+                    else:
+                        log.d("CRC check: OK")
+
+            with transfer_lock:
+                split_incoming = split_incomings[fpath]
+                split_incoming["remaining"] -= length
+
+                if split_incoming["remaining"] > 0:
+                    return checked
+
+                # Last range of the file
+                del split_incomings[fpath]
+
+            if split_incoming["fd"]:
+                log.i(f"Closing file {fpath}")
+                split_incoming["fd"].close()
+
+            if split_incoming["sized"]:
+                # Adjust the mtime based on the remote
+                log.d(f"Setting mtime = {fmtime}")
+                set_mtime(fpath, fmtime, round_up=True)
+
+            return checked
+
+        # Pipelined mode: the client sends up to 'window' file infos ahead;
+        # we reply to each of them as soon as it arrives, and then receive
+        # the data of the accepted files in the same order of the infos.
+        # Since both the sides keep exactly 'window' pending infos,
+        # the stream is deterministic and no round trip is spent per file.
+
+        def receive_pipelined(handler: 'ClientHandler', recv_buffer_: memoryview):
+            pending: Deque[Optional[Tuple]] = deque([])
+            done = False
+
+            def receive_next_info():
+                nonlocal done
+
+                req = handler._recv_json(timeout=DEFAULT_TRANSFER_SOCKET_TIMEOUT)
+
+                if not req or not req.get(RequestsParams.PUT_NEXT_FILE):
+                    log.i("<< PUT_NEXT DONE")
+                    handler._send_response(create_success_response())
+                    done = True
+                    return
+
+                with transfer_lock:
+                    resp, incoming = handle_put_next_request(req, pipelined=True)
+
+                handler._send_response(resp)
+                pending.append(incoming)
+
+            while not done and len(pending) < window:
+                receive_next_info()
+
+            while pending:
+                incoming = pending.popleft()
+
+                if incoming:
+                    status, fpath, fsize, fmtime, fd, frange = incoming
+
+                    if status == ResponsesParams.PUT_NEXT_STATUS_UNCERTAIN:
+                        # The client asked the user and tells us the decision
+                        resolution = handler._recv_json(timeout=DEFAULT_TRANSFER_SOCKET_TIMEOUT)
+                        overwrite = resolution.get(RequestsParams.PUT_NEXT_OVERWRITE) if resolution else None
+
+                        log.i(f"<< PUT_NEXT overwrite = {overwrite} ({fpath})")
+
+                        if frange:
+                            # The file is shared among the ranges:
+                            # truncate it only for the first accepted one
+                            if overwrite == RequestsParams.PUT_NEXT_OVERWRITE_YES:
+                                with transfer_lock:
+                                    split_incoming = split_incomings[fpath]
+                                    if not split_incoming["sized"]:
+                                        fd.truncate(fsize)
+                                        split_incoming["sized"] = True
+                            else:
+                                fd = None
+                        elif fd:
+                            if overwrite == RequestsParams.PUT_NEXT_OVERWRITE_YES:
+                                fd.truncate(0)
+                            else:
+                                fd.close()
+                                fd = None
+
+                    if frange:
+                        receive_range(fpath, fmtime, fd, frange,
+                                      handler._client.socket, recv_buffer_)
+                    elif fd:
+                        # fd is None if it's just a preview
+                        receive_incoming(fpath, fsize, fmtime, fd,
+                                         handler._client.socket, recv_buffer_)
+
+                if not done:
+                    receive_next_info()
+
+        def serve_attached(handler: 'ClientHandler') -> Response:
+            """
+            Receives the files over a data connection attached to the transfer,
+            in the same way receive_pipelined() does over this connection.
+            Returns the outcome for the data connection.
+            """
+            handler._send_response(create_success_response({
+                ResponsesParams.PUT_WINDOW: window
+            }))
+
+            receive_pipelined(handler, memoryview(bytearray(BEST_BUFFER_SIZE)))
+
+            return create_success_response({
+                ResponsesParams.PUT_OUTCOME: outcome
+            })
+
+        def put_next():
+            while True:
+                log.d("Waiting for next() request from client...")
+
+                # 1. Receive the request from the client
+
+                # e.g. {file: {name: f1, size: 293}, overwrite: "..."} // client doesn't provide the path
+
+                req = self._recv_json(timeout=DEFAULT_TRANSFER_SOCKET_TIMEOUT)
+
+                if not req.get(RequestsParams.PUT_NEXT_FILE):
+                    log.i("<< PUT_NEXT DONE")
+                    self._send_response(create_success_response())
+                    break
+
+                resp, incoming = handle_put_next_request(req)
+                self._send_response(resp)
+
+                if incoming and incoming[0] == ResponsesParams.PUT_NEXT_STATUS_ACCEPTED:
+                    return incoming[1:5]
+
+        token = None
+
+        if window and parallel:
+            # The files are received over the data connections the client
+            # attaches to this transfer, while this one stays idle
+            token = self._api_daemon.add_transfer(self._client.endpoint[0], serve_attached)
+            self._send_response(create_success_response({
+                ResponsesParams.PUT_WINDOW: window,
+                ResponsesParams.PUT_PARALLEL: parallel,
+                ResponsesParams.PUT_SPLIT: split,
+                ResponsesParams.PUT_TOKEN: token
+            }))
+        elif window:
+            self._send_response(create_success_response({
+                ResponsesParams.PUT_WINDOW: window
+            }))
+        else:
+            self._send_response(create_success_response())
+
+        if token:
+            try:
+                log.d("Waiting for the end of the data connections...")
+                self._recv_json()
+            finally:
+                self._api_daemon.remove_transfer(token)
+        elif window:
+            receive_pipelined(self, recv_buffer)
+        else:
+            while True:
+                log.d("Blocking and waiting for a file to handle...")
+
+                # Recv files until the incomings buffer is empty
+                # Wait on the blocking queue for the next file to recv
+                next_incoming = put_next()
+
+                if next_incoming is None:
+                    log.i("No more files: transfer completed")
+                    break
+
+                if preview:
+                    log.i("Just a preview, not transferring file for real")
+                    # Don't transfer, just a preview
+                    continue
+
+                if not receive_incoming(*next_incoming, transfer_socket, recv_buffer):
+                    break
+
         log.i("PUT finished")
 
         compute_sync_table()
@@ -37,6 +37,8 @@ class Requests:
     GET = "get"
     PUT = "put"
 
+    ATTACH = "attach"
+
 
 class RequestsParams:
     CONNECT_PASSWORD = "password"
@@ -92,6 +94,9 @@ class RequestsParams:
     GET_NO_HIDDEN = "no_hidden"
     GET_CHUNK_SIZE = "chunk_size"
     GET_MMAP = "mmap"
+    GET_WINDOW = "window"
+    GET_PARALLEL = "parallel"
+    GET_SPLIT = "split"
 
     GET_NEXT_ACTION = "action"
     GET_NEXT_ACTION_SEEK = "seek"
@@ -105,9 +110,13 @@ class RequestsParams:
     PUT_PREVIEW = "preview"
     PUT_DEST = "dest"
     PUT_IS_MULTIPLE = "is_multiple"
+    PUT_WINDOW = "window"
+    PUT_PARALLEL = "parallel"
+    PUT_SPLIT = "split"
 
     PUT_NEXT_FILE = "file"
     PUT_NEXT_SYNC = "sync"
+    PUT_NEXT_RANGE = "range"
     PUT_NEXT_OVERWRITE = "overwrite"
     PUT_NEXT_OVERWRITE_PROMPT = "prompt"
     PUT_NEXT_OVERWRITE_YES = "yes"
@@ -126,6 +135,8 @@ class RequestsParams:
                            PUT_NEXT_OVERWRITE_DIFF_SIZE,
                            PUT_NEXT_OVERWRITE_NEWER_DIFF_SIZE]
 
+    ATTACH_TOKEN = "token"
+
 RequestParams = Dict[str, Any]
 
 try:
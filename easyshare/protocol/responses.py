@@ -47,13 +47,21 @@ class ServerErrors:
 class ResponsesParams:
     GET_OUTCOME = "outcome"
     GET_NEXT_FILE = "file"
+    GET_NEXT_RANGE = "range"
     GET_ERRORS = "errors"
+    GET_WINDOW = "window"
+    GET_PARALLEL = "parallel"
+    GET_TOKEN = "token"
 
     PUT_OUTCOME = "outcome"
     PUT_ERRORS = "errors"
     PUT_SYNC_OKS = "sync_oks"
     PUT_SYNC_ERRORS = "sync_errors"
     PUT_ABORT = "abort"
+    PUT_WINDOW = "window"
+    PUT_PARALLEL = "parallel"
+    PUT_SPLIT = "split"
+    PUT_TOKEN = "token"
 
     PUT_NEXT_FILE_INFO = "file"
     PUT_NEXT_ALREADY_EXISTS = "exists"
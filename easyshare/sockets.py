@@ -2,7 +2,7 @@ import socket
 import ssl
 
 from abc import ABC
-from typing import Optional, Union, Tuple
+from typing import Optional, Union, Tuple, BinaryIO
 
 from easyshare.common import TransferDirection, TransferProtocol
 from easyshare.consts.net import ADDR_BROADCAST, ADDR_ANY, PORT_ANY
@@ -114,10 +114,6 @@ class SocketUdpOut(SocketUdp):
 
 
 class SocketTcp(Socket):
-    def __init__(self, sock: socket.socket):
-        super().__init__(sock)
-        self._recv_buffer = bytearray()
-
     def send(self, data: bytes, trace: bool = True):
         if trace:
             trace_bin(data,
@@ -126,29 +122,49 @@ class SocketTcp(Socket):
 
         self.sock.sendall(data)
 
+    def sendfile(self, f: BinaryIO, offset: int = 0, count: int = None) -> int:
+        """
+        Sends 'count' bytes of the file 'f' starting from 'offset'.
+        Uses the zero-copy os.sendfile() if possible (i.e. not for SSL
+        sockets), otherwise falls back to a regular send() loop.
+        The data is never traced since it doesn't reach the user space.
+        """
+        return self.sock.sendfile(f, offset, count)
+
     def recv(self, length: int, trace: bool = True) -> Optional[bytearray]:
-        while True:
-            remaining_length = length - len(self._recv_buffer)
-            if remaining_length <= 0:
-                break
+        data = bytearray(length)
 
-            recvlen = min(remaining_length, DEFAULT_SOCKET_BUFSIZE)
-            data = self.sock.recv(recvlen)
+        if self.readinto(data, trace=trace) < length:
+            return None
 
-            if len(data) == 0:
-                return None
+        return data
 
-            self._recv_buffer += data
+    def readinto(self, buffer: Union[bytearray, memoryview], trace: bool = True) -> int:
+        """
+        Receives exactly len(buffer) bytes directly into 'buffer'
+        (which can be a memoryview over a preallocated bytearray),
+        without any intermediate copy.
+        Returns the number of bytes received, which is less than
+        len(buffer) only if the connection has been closed.
+        """
+        view = memoryview(buffer)
+        length = len(view)
+        pos = 0
+
+        while pos < length:
+            n = self.sock.recv_into(view[pos:], length - pos)
+
+            if n == 0:
+                break
+
+            pos += n
 
-        data = self._recv_buffer[0:length]
-        self._recv_buffer = self._recv_buffer[length:]  # might have read more
-                                                        # than the required length
         if trace:
-            trace_bin(data,
+            trace_bin(view[:pos],
                    sender=self.remote_endpoint(), receiver=self.endpoint(),
                    direction=TransferDirection.IN, protocol=TransferProtocol.TCP)
 
-        return data
+        return pos
 
     def remote_endpoint(self) -> Optional[Endpoint]:
         try:
@@ -90,6 +90,9 @@ def assert_file(file: Union[Path, str], size_checker=lambda s: s > 0):
 def assert_notexists(something: Union[Path, str]):
     assert not Path(something).exists()
 
+def assert_same_content(file1: Union[Path, str], file2: Union[Path, str]):
+    assert Path(file1).read_bytes() == Path(file2).read_bytes()
+
 def assert_success(res):
     assert res == ClientErrors.SUCCESS
     
@@ -3447,6 +3450,209 @@ def test_put_syncdest_2_any2dir_bis():
             assert_file(wontberemoved)
             assert_notexists(willberemoved)
 
+def test_get_window_1():
+    """
+    > cd client-XXXX
+    > get --window 1 d0
+    """
+
+    with tempfile.TemporaryDirectory(prefix="client-") as local_tmp:
+        with EsConnectionTest(esd.sharing_root_d.name, cd=local_tmp) as client:
+            assert_success(
+                client.execute_command(Commands.GET, f"{Get.WINDOW[0]} 1 d0")
+            )
+            check_hierarchy(Path(local_tmp), {
+                "d0": D0
+            }, dump=False)
+            assert_same_content(Path(local_tmp) / "d0" / "d2" / "ff2",
+                                server_hierarchy / "d0" / "d2" / "ff2")
+
+
+def test_get_check():
+    """
+    > cd client-XXXX
+    > get -c d0
+    """
+
+    with tempfile.TemporaryDirectory(prefix="client-") as local_tmp:
+        with EsConnectionTest(esd.sharing_root_d.name, cd=local_tmp) as client:
+            assert_success(
+                client.execute_command(Commands.GET, f"{Get.CHECK[0]} d0")
+            )
+            check_hierarchy(Path(local_tmp), {
+                "d0": D0
+            }, dump=False)
+            assert_same_content(Path(local_tmp) / "d0" / "d2" / "ff1",
+                                server_hierarchy / "d0" / "d2" / "ff1")
+
+
+def test_get_no_window():
+    """
+    > cd client-XXXX
+    > get --window 0 d0
+    > get --window 0 -n d0
+    """
+
+    with tempfile.TemporaryDirectory(prefix="client-") as local_tmp:
+        with EsConnectionTest(esd.sharing_root_d.name, cd=local_tmp) as client:
+            assert_success(
+                client.execute_command(Commands.GET, f"{Get.WINDOW[0]} 0 d0")
+            )
+            check_hierarchy(Path(local_tmp), {
+                "d0": D0
+            }, dump=False)
+            assert_same_content(Path(local_tmp) / "d0" / "f1",
+                                server_hierarchy / "d0" / "f1")
+
+            assert_success(
+                client.execute_command(Commands.GET, f"{Get.WINDOW[0]} 0 {Get.OVERWRITE_NO[0]} d0")
+            )
+
+
+def test_put_window_1():
+    """
+    > cd client-XXXX
+    > put --window 1 d0
+    > put --window 1 -S d0
+    """
+
+    with tempfile.TemporaryDirectory(prefix="server-", dir=esd.sharing_root_d2) as remote_tmp:
+        with EsConnectionTest(esd.sharing_root_d2.name,
+                              cd=client_hierarchy,
+                              rcd=Path(remote_tmp).name) as client:
+            assert_success(
+                client.execute_command(Commands.PUT, f"{Put.WINDOW[0]} 1 d0")
+            )
+
+            check_hierarchy(Path(remote_tmp), {
+                "d0": D0
+            }, dump=False)
+            assert_same_content(Path(remote_tmp) / "d0" / "d2" / "ff2",
+                                client_hierarchy / "d0" / "d2" / "ff2")
+
+            assert_success(
+                client.execute_command(Commands.PUT, f"{Put.WINDOW[0]} 1 {Put.OVERWRITE_DIFF_SIZE[0]} d0")
+            )
+
+
+def test_put_no_window():
+    """
+    > cd client-XXXX
+    > put --window 0 d0
+    """
+
+    with tempfile.TemporaryDirectory(prefix="server-", dir=esd.sharing_root_d2) as remote_tmp:
+        with EsConnectionTest(esd.sharing_root_d2.name,
+                              cd=client_hierarchy,
+                              rcd=Path(remote_tmp).name) as client:
+            assert_success(
+                client.execute_command(Commands.PUT, f"{Put.WINDOW[0]} 0 d0")
+            )
+
+            check_hierarchy(Path(remote_tmp), {
+                "d0": D0
+            }, dump=False)
+            assert_same_content(Path(remote_tmp) / "d0" / "f1",
+                                client_hierarchy / "d0" / "f1")
+
+
+def test_get_parallel():
+    """
+    > cd client-XXXX
+    > get --parallel 3 -c d0
+    """
+
+    with tempfile.TemporaryDirectory(prefix="client-") as local_tmp:
+        with EsConnectionTest(esd.sharing_root_d.name, cd=local_tmp) as client:
+            assert_success(
+                client.execute_command(Commands.GET, f"{Get.PARALLEL[0]} 3 {Get.CHECK[0]} d0")
+            )
+            check_hierarchy(Path(local_tmp), {
+                "d0": D0
+            }, dump=False)
+            assert_same_content(Path(local_tmp) / "d0" / "d2" / "ff2",
+                                server_hierarchy / "d0" / "d2" / "ff2")
+
+
+def test_put_parallel():
+    """
+    > cd client-XXXX
+    > put --parallel 3 d0
+    > put --parallel 3 -n d0
+    """
+
+    with tempfile.TemporaryDirectory(prefix="server-", dir=esd.sharing_root_d2) as remote_tmp:
+        with EsConnectionTest(esd.sharing_root_d2.name,
+                              cd=client_hierarchy,
+                              rcd=Path(remote_tmp).name) as client:
+            assert_success(
+                client.execute_command(Commands.PUT, f"{Put.PARALLEL[0]} 3 d0")
+            )
+
+            check_hierarchy(Path(remote_tmp), {
+                "d0": D0
+            }, dump=False)
+            assert_same_content(Path(remote_tmp) / "d0" / "d2" / "ff2",
+                                client_hierarchy / "d0" / "d2" / "ff2")
+
+            assert_success(
+                client.execute_command(Commands.PUT, f"{Put.PARALLEL[0]} 3 {Put.OVERWRITE_NO[0]} d0")
+            )
+
+
+def test_get_split():
+    """
+    > cd client-XXXX
+    > get --parallel 3 --split-size 100000 -c d0
+    """
+
+    with tempfile.TemporaryDirectory(prefix="client-") as local_tmp:
+        with EsConnectionTest(esd.sharing_root_d.name, cd=local_tmp) as client:
+            assert_success(
+                client.execute_command(Commands.GET, f"{Get.PARALLEL[0]} 3 "
+                                                     f"{Get.SPLIT_SIZE[0]} 100000 {Get.CHECK[0]} d0")
+            )
+            check_hierarchy(Path(local_tmp), {
+                "d0": D0
+            }, dump=False)
+            assert_same_content(Path(local_tmp) / "d0" / "d2" / "ff2",
+                                server_hierarchy / "d0" / "d2" / "ff2")
+            assert_same_content(Path(local_tmp) / "d0" / "f1",
+                                server_hierarchy / "d0" / "f1")
+
+
+def test_put_split():
+    """
+    > cd client-XXXX
+    > put --parallel 3 --split-size 100000 -c d0
+    > put --parallel 3 --split-size 100000 -y d0
+    """
+
+    with tempfile.TemporaryDirectory(prefix="server-", dir=esd.sharing_root_d2) as remote_tmp:
+        with EsConnectionTest(esd.sharing_root_d2.name,
+                              cd=client_hierarchy,
+                              rcd=Path(remote_tmp).name) as client:
+            assert_success(
+                client.execute_command(Commands.PUT, f"{Put.PARALLEL[0]} 3 "
+                                                     f"{Put.SPLIT_SIZE[0]} 100000 {Put.CHECK[0]} d0")
+            )
+
+            check_hierarchy(Path(remote_tmp), {
+                "d0": D0
+            }, dump=False)
+            assert_same_content(Path(remote_tmp) / "d0" / "d2" / "ff2",
+                                client_hierarchy / "d0" / "d2" / "ff2")
+            assert_same_content(Path(remote_tmp) / "d0" / "f1",
+                                client_hierarchy / "d0" / "f1")
+
+            assert_success(
+                client.execute_command(Commands.PUT, f"{Put.PARALLEL[0]} 3 "
+                                                     f"{Put.SPLIT_SIZE[0]} 100000 {Put.OVERWRITE_YES[0]} d0")
+            )
+            assert_same_content(Path(remote_tmp) / "d0" / "d2" / "ff2",
+                                client_hierarchy / "d0" / "d2" / "ff2")
+
+
 def test_teardown():
     esd.__exit__(None, None, None)
     rm(client_hierarchy)
\ No newline at end of file